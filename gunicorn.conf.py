@@ -0,0 +1,193 @@
+"""
+Gunicorn configuration (picked up automatically from the working directory,
+/srv/tradegate/app, or pass `-c gunicorn.conf.py`). Flags given on the
+command line in the systemd unit still win over this file.
+
+Everything is driven by environment variables (systemd EnvironmentFile):
+
+    GUNICORN_WORKER_CLASS   sync (default) | gthread | uvicorn
+    GUNICORN_WORKERS        default 2 * CPUs + 1 (sync), CPUs + 1 otherwise
+    GUNICORN_THREADS        gthread only, default 4
+    GUNICORN_BIND           default 127.0.0.1:8000 (or unix:/run/tradegate.sock)
+    GUNICORN_PRELOAD        default true: load Django once in the master
+    GUNICORN_MAX_REQUESTS   recycle a worker after this many requests (default 2000)
+    GUNICORN_MAX_REQUESTS_JITTER  default 200, so workers don't restart together
+    GUNICORN_MAX_RSS_MB     recycle a worker above this resident memory (0 = off)
+    GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT / GUNICORN_KEEPALIVE
+    DB_MAX_CONNECTIONS      Postgres max_connections (or the pgbouncer pool)
+                            to warn at start if all workers could exceed it
+    GUNICORN_WARMUP         default true: warm caches in each new worker
+                            (website.warmup, before its first request)
+    DJANGO_WARMUP           code (default) | full | off: what tradegate.wsgi
+                            and asgi warm at import, i.e. in the master
+
+uvicorn runs tradegate.asgi with the async views (DJANGO_ASYNC_VIEWS).
+"""
+
+import gc
+import glob
+import logging
+import multiprocessing
+import os
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def env(key: str, default: str = "") -> str:
+    return os.getenv(key, default)
+
+
+def env_bool(key: str, default: bool = False) -> bool:
+    val = os.getenv(key)
+    if val is None:
+        return default
+    return val.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# =========================
+# Workers
+# =========================
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn.workers.UvicornWorker",
+}
+
+_kind = env("GUNICORN_WORKER_CLASS", "sync").strip().lower()
+if _kind not in WORKER_CLASSES:
+    raise RuntimeError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, not {_kind!r}")
+
+worker_class = WORKER_CLASSES[_kind]
+_cpus = multiprocessing.cpu_count()
+workers = int(env("GUNICORN_WORKERS", str(_cpus * 2 + 1 if _kind == "sync" else _cpus + 1)))
+
+# Connections one worker can hold at once: one per request-running thread
+_db_connections = 1
+if _kind == "gthread":
+    threads = int(env("GUNICORN_THREADS", "4"))
+    _db_connections = threads
+elif _kind == "uvicorn":
+    # Each request's sync ORM work runs in a thread of its own
+    _db_connections = 10
+
+if _kind == "uvicorn":
+    wsgi_app = "tradegate.asgi:application"
+    os.environ.setdefault("DJANGO_ASYNC_VIEWS", "true")
+else:
+    wsgi_app = "tradegate.wsgi:application"
+
+bind = [b.strip() for b in env("GUNICORN_BIND", "127.0.0.1:8000").split(",") if b.strip()]
+
+# Import Django (settings, URLconf, models, templates code) once in the
+# master; workers share those pages copy-on-write. tradegate.wsgi/asgi also
+# build the URL resolver and compile the templates there (DJANGO_WARMUP=code).
+# No DB connection is made before fork: the data warm-up happens in each
+# worker (post_worker_init).
+preload_app = env_bool("GUNICORN_PRELOAD", True)
+
+max_requests = int(env("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(env("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+timeout = int(env("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(env("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# Behind nginx: keep upstream connections a little longer than nginx does
+keepalive = int(env("GUNICORN_KEEPALIVE", "5"))
+
+# Worker heartbeat files on tmpfs, not on a disk that may stall
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = env("GUNICORN_ACCESS_LOG", "") or None
+errorlog = "-"
+loglevel = env("GUNICORN_LOG_LEVEL", "info")
+proc_name = "tradegate"
+
+MAX_RSS_BYTES = int(env("GUNICORN_MAX_RSS_MB", "0")) * 1024 * 1024
+# Reading /proc is cheap, but there is no need to do it on every request
+RSS_CHECK_EVERY = int(env("GUNICORN_RSS_CHECK_EVERY", "20"))
+
+
+# =========================
+# Hooks
+# =========================
+def _resident_memory() -> int:
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def on_starting(server):
+    # Metric files of the previous master's workers (website.metrics)
+    metrics_dir = env("METRICS_DIR")
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, "*.json")):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def when_ready(server):
+    per_worker = _db_connections
+    total = workers * per_worker
+    limit = int(env("DB_MAX_CONNECTIONS", "0"))
+    if limit and total > limit:
+        logger.warning(
+            "%s workers x %s DB connections = %s, more than DB_MAX_CONNECTIONS=%s", workers, per_worker, total, limit
+        )
+    else:
+        logger.info("Up to %s DB connections (%s workers x %s)", total, workers, per_worker)
+
+    if preload_app:
+        # Move the preloaded objects out of the GC's reach so collections in
+        # the workers don't write to (and un-share) those pages.
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    worker._requests_seen = 0
+
+
+def post_worker_init(worker):
+    # Runs in the new worker right after fork (preload) or after it loaded
+    # the app itself, before it accepts the first connection.
+    if not env_bool("GUNICORN_WARMUP", True):
+        return
+    try:
+        from website.warmup import warm
+
+        warm()
+    except Exception:
+        # Never keep a worker from starting
+        logger.exception("Worker %s warm-up failed", worker.pid)
+
+
+def post_request(worker, req, environ, resp):
+    # Not called by the uvicorn worker class; max_requests still applies there.
+    if not MAX_RSS_BYTES:
+        return
+    worker._requests_seen = getattr(worker, "_requests_seen", 0) + 1
+    if worker._requests_seen % RSS_CHECK_EVERY:
+        return
+
+    rss = _resident_memory()
+    if rss > MAX_RSS_BYTES:
+        logger.warning(
+            "Worker %s uses %.0f MB (limit %.0f MB); restarting it after this request",
+            worker.pid,
+            rss / 1024 / 1024,
+            MAX_RSS_BYTES / 1024 / 1024,
+        )
+        # Finish in-flight work, then exit; the arbiter starts a fresh worker
+        worker.alive = False
+
+
+def worker_exit(server, worker):
+    try:
+        from website import metrics
+
+        metrics.retire()
+    except Exception:
+        pass
@@ -11,6 +11,16 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tradegate.settings")
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE",
+    os.getenv("DJANGO_SETTINGS_MODULE", "tradegate.settings.prod"),
+)
 
+# Pair with DJANGO_ASYNC_VIEWS=true, e.g.
+#   DJANGO_ASYNC_VIEWS=true uvicorn tradegate.asgi:application --workers 2
 application = get_asgi_application()
+
+# URL resolver + compiled templates before the first request (DJANGO_WARMUP)
+from website.warmup import warm_on_startup  # noqa: E402
+
+warm_on_startup()
@@ -1,6 +1,8 @@
 from pathlib import Path
 import os
 
+from website.release import release_id
+
 # settings/ is one level deeper than the project root
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -53,13 +55,22 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Per-phase timing: Server-Timing header, log line, p50/p95/p99 per URL
+    "website.middleware.TimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Serves STATIC_ROOT with far-future headers for hashed files
+    # (WhiteNoise, plus an async path for ASGI)
+    "website.middleware.WhiteNoiseMiddleware",
+    # Counts SQL per request (Server-Timing header, budget / N+1 warnings)
+    "website.middleware.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Keep last: times the view body for TimingMiddleware
+    "website.middleware.ViewTimingMiddleware",
 ]
 
 ROOT_URLCONF = "tradegate.urls"
@@ -67,12 +78,17 @@ WSGI_APPLICATION = "tradegate.wsgi.application"
 ASGI_APPLICATION = "tradegate.asgi.application"
 APPEND_SLASH = True
 
+# Serve the public pages from website/async_views.py. Use with the ASGI app
+# (uvicorn); under gunicorn sync workers the sync views are faster.
+ASYNC_VIEWS = env_bool("DJANGO_ASYNC_VIEWS", False)
+
 # =========================
 # Templates
 # =========================
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates that also times rendering and each context processor
+        "BACKEND": "website.timing.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "website" / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -86,30 +102,156 @@ TEMPLATES = [
     },
 ]
 
+# Render {% prerendered %} blocks once per content version and reuse them
+# (see website/templatetags/fragments.py). Measure with `manage.py bench_templates`.
+TEMPLATE_STATIC_FRAGMENTS = env_bool("TEMPLATE_STATIC_FRAGMENTS", False)
+
 # =========================
 # Database
 # =========================
+# DB_POOL_MODE (Postgres only):
+#   persistent -> one connection per worker thread, kept for DB_CONN_MAX_AGE
+#                 seconds (default)
+#   pgbouncer  -> the same, but DB_HOST/DB_PORT point at pgbouncer in
+#                 transaction mode: server-side cursors are disabled
+# In both modes a connection is checked before it is reused for a new request
+# (DB_CONN_HEALTH_CHECKS), so one dropped by the server or a restart is
+# replaced instead of failing the request with a 500.
 DB_NAME = env("DB_NAME", "")
+DB_POOL_MODE = env("DB_POOL_MODE", "persistent").strip().lower()
 if DB_NAME:
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql",
+            # Django's postgresql backend plus connection metrics
+            "ENGINE": "website.db_backends.postgresql",
             "NAME": DB_NAME,
             "USER": env("DB_USER", ""),
             "PASSWORD": env("DB_PASSWORD", ""),
             "HOST": env("DB_HOST", "127.0.0.1"),
             "PORT": env("DB_PORT", "5432"),
             "CONN_MAX_AGE": int(env("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": env_bool("DB_CONN_HEALTH_CHECKS", True),
+            "OPTIONS": {
+                "connect_timeout": int(env("DB_CONNECT_TIMEOUT", "5")),
+            },
         }
     }
+    if DB_POOL_MODE == "pgbouncer":
+        # Transaction pooling can't keep a cursor open across transactions
+        DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
 else:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
+            "NAME": env("DJANGO_SQLITE_PATH", "") or BASE_DIR / "db.sqlite3",
         }
     }
 
+# Inquiry admin search on Postgres: ranked full-text + trigram (website/search.py).
+# Text search configuration: simple (no stemming), german, english, ...
+INQUIRY_FULLTEXT_SEARCH = env_bool("INQUIRY_FULLTEXT_SEARCH", True)
+INQUIRY_SEARCH_CONFIG = env("INQUIRY_SEARCH_CONFIG", "simple")
+
+# Admin changelists with website.pagination.EstimatedCountPaginator: above this
+# many rows (planner estimate, Postgres) show the estimate instead of COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(env("ADMIN_ESTIMATED_COUNT_THRESHOLD", "10000"))
+
+# Inquiry export (admin actions, `manage.py export_inquiries`): rows per query
+EXPORT_CHUNK_SIZE = int(env("EXPORT_CHUNK_SIZE", "2000"))
+
+# Retention (`manage.py purge_inquiries`, website/retention.py): inquiries and
+# their notification emails are deleted after this many days, in batches
+INQUIRY_RETENTION_DAYS = int(env("INQUIRY_RETENTION_DAYS", "365"))
+INQUIRY_PURGE_BATCH_SIZE = int(env("INQUIRY_PURGE_BATCH_SIZE", "500"))
+INQUIRY_PURGE_SLEEP = float(env("INQUIRY_PURGE_SLEEP", "0.2"))  # seconds between batches
+
+# =========================
+# Caches
+# =========================
+# L1: bounded per-process LocMem (LRU). Always present.
+# L2 (optional, shared by all gunicorn workers):
+#   CACHE_L2=file   -> FileBasedCache in CACHE_L2_LOCATION (a directory)
+#   CACHE_L2=redis  -> RedisCache at CACHE_L2_LOCATION, e.g.
+#                      unix:///run/redis/redis.sock (needs `pip install redis`)
+# With an L2, "default" is a two-tier read-through cache over both
+# (website.cache_backends.TieredCache). All site caches use "default".
+CACHE_L1_MAX_ENTRIES = int(env("CACHE_L1_MAX_ENTRIES", "2000"))
+CACHE_L1_TIMEOUT = int(env("CACHE_L1_TIMEOUT", "30"))
+CACHE_L2 = env("CACHE_L2", "").strip().lower()
+
+CACHES = {
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tradegate-l1",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": CACHE_L1_MAX_ENTRIES, "CULL_FREQUENCY": 4},
+    },
+}
+
+if CACHE_L2 == "file":
+    CACHES["shared"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": env("CACHE_L2_LOCATION", "/srv/tradegate/cache"),
+        "TIMEOUT": 600,
+        "OPTIONS": {"MAX_ENTRIES": int(env("CACHE_L2_MAX_ENTRIES", "10000"))},
+    }
+elif CACHE_L2 == "redis":
+    CACHES["shared"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("CACHE_L2_LOCATION", "unix:///run/redis/redis.sock"),
+        "TIMEOUT": 600,
+        "KEY_PREFIX": "tradegate",
+    }
+
+if "shared" in CACHES:
+    CACHES["default"] = {
+        "BACKEND": "website.cache_backends.TieredCache",
+        "OPTIONS": {
+            "L1": "local",
+            "L2": "shared",
+            "L1_TIMEOUT": CACHE_L1_TIMEOUT,
+            # Version keys: other workers see a bump within ~2s
+            "L1_KEY_TIMEOUTS": {"website:version:": 2},
+        },
+    }
+else:
+    CACHES["default"] = CACHES["local"]
+
+# =========================
+# Site caches
+# =========================
+# Share cache invalidation across gunicorn workers through a version key in the
+# Django cache. On by default once there is a shared L2 cache.
+SITE_CACHE_SHARED_VERSIONS = env_bool("SITE_CACHE_SHARED_VERSIONS", "shared" in CACHES)
+# Without shared versions, other workers can't see an admin edit: their
+# process memos (settings, navigation, content stamps, prerendered fragments)
+# expire after this many seconds instead.
+SITE_CACHE_LOCAL_TTL = float(env("SITE_CACHE_LOCAL_TTL", "5"))
+
+# Cached pages and fragments are keyed on a version that edits bump. Without
+# shared versions each worker only sees its own bumps, and the cache itself is
+# per process, so other workers keep serving the old copy until it times out:
+# keep those timeouts as short as the memo TTL then.
+LOCAL_CACHE_TIMEOUT = int(env("LOCAL_CACHE_TIMEOUT", "10"))  # seconds
+
+# Full-page cache for anonymous GETs of home/about/faq/legal pages.
+# Purged automatically when content models are saved or deleted.
+PAGE_CACHE_ENABLED = env_bool("PAGE_CACHE_ENABLED", False)
+PAGE_CACHE_TIMEOUT = int(
+    env("PAGE_CACHE_TIMEOUT", "600" if SITE_CACHE_SHARED_VERSIONS else str(LOCAL_CACHE_TIMEOUT))
+)
+
+# Header/footer fragments in base.html ({% cache %}, keyed on the settings +
+# navigation version: with shared versions, edits show up immediately)
+FRAGMENT_CACHE_TIMEOUT = int(
+    env("FRAGMENT_CACHE_TIMEOUT", "86400" if SITE_CACHE_SHARED_VERSIONS else str(LOCAL_CACHE_TIMEOUT))
+)
+
+# Part of the public pages' ETag, so a deploy that changes templates is not
+# hidden behind 304s. The deploy workflow writes the commit to RELEASE in the
+# app directory; without it (development) the checked-out commit is used.
+RELEASE_ID = env("DJANGO_RELEASE_ID", "") or release_id(BASE_DIR)
+
 # =========================
 # Password validation
 # =========================
@@ -143,6 +285,19 @@ STATICFILES_FINDERS = [
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
 ]
 
+# Dev: plain storage (no collectstatic needed). Prod swaps in the compressed
+# manifest storage (see prod.py).
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Tailwind standalone CLI used by `manage.py build_css`
+TAILWIND_CLI = env("TAILWIND_CLI", "tailwindcss")
+
+# Source TTFs for `manage.py build_fonts` (the deploy keeps them in /srv/tradegate/fonts)
+FONT_SOURCE_DIR = env("FONT_SOURCE_DIR", "")
+
 # =========================
 # Sites framework
 # =========================
@@ -165,6 +320,60 @@ EMAIL_USE_TLS = env_bool("EMAIL_USE_TLS", True)
 EMAIL_USE_SSL = env_bool("EMAIL_USE_SSL", False)
 EMAIL_TIMEOUT = int(env("EMAIL_TIMEOUT", "20"))
 
+# Set to true to queue contact notifications in the OutboundEmail table instead
+# of sending them inside the request. Only once `manage.py send_outbox` runs
+# on the server (systemd service with --loop, or cron): nothing else delivers
+# the queue.
+EMAIL_OUTBOX_ENABLED = env_bool("EMAIL_OUTBOX_ENABLED", False)
+EMAIL_OUTBOX_BATCH_SIZE = int(env("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(env("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+EMAIL_OUTBOX_BACKOFF_BASE = int(env("EMAIL_OUTBOX_BACKOFF_BASE", "30"))  # seconds
+EMAIL_OUTBOX_BACKOFF_MAX = int(env("EMAIL_OUTBOX_BACKOFF_MAX", "3600"))  # seconds
+# How long a claimed batch stays reserved to one worker; longer than a batch takes
+EMAIL_OUTBOX_LEASE = int(env("EMAIL_OUTBOX_LEASE", "600"))  # seconds
+
+# =========================
+# Query budget (website.middleware.QueryBudgetMiddleware)
+# =========================
+QUERY_BUDGET_ENABLED = env_bool("QUERY_BUDGET_ENABLED", True)
+QUERY_BUDGET_MAX_QUERIES = int(env("QUERY_BUDGET_MAX_QUERIES", "10"))
+QUERY_BUDGET_MAX_DB_MS = int(env("QUERY_BUDGET_MAX_DB_MS", "200"))
+# Same SQL this many times in one request is logged as a likely N+1
+QUERY_BUDGET_REPEAT_THRESHOLD = int(env("QUERY_BUDGET_REPEAT_THRESHOLD", "3"))
+QUERY_BUDGET_SERVER_TIMING = env_bool("QUERY_BUDGET_SERVER_TIMING", True)
+
+# =========================
+# Request timing (website.timing)
+# =========================
+REQUEST_TIMING_ENABLED = env_bool("REQUEST_TIMING_ENABLED", True)
+# One "timing method=... total=... view=... render=..." line per request
+REQUEST_TIMING_LOG = env_bool("REQUEST_TIMING_LOG", False)
+# Recent samples kept per URL name and phase for the percentiles
+REQUEST_TIMING_SAMPLES = int(env("REQUEST_TIMING_SAMPLES", "1024"))
+# Server-Timing header for every visitor; otherwise staff users only
+SERVER_TIMING_PUBLIC = env_bool("SERVER_TIMING_PUBLIC", False)
+
+# =========================
+# Readiness probe (website.health, served at /ready/)
+# =========================
+READINESS_TIMEOUT = float(env("READINESS_TIMEOUT", "2"))  # seconds, all checks together
+READINESS_CACHE_SECONDS = float(env("READINESS_CACHE_SECONDS", "3"))
+# Also NOOP the SMTP relay (contact mail is queued, so off by default)
+READINESS_CHECK_SMTP = env_bool("READINESS_CHECK_SMTP", False)
+
+# =========================
+# Metrics (website.metrics, served at /metrics)
+# =========================
+# Shared directory for per-process metric files, so /metrics adds up all
+# gunicorn workers and `send_outbox`. Empty: the answering process only.
+METRICS_DIR = env("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = int(env("METRICS_FLUSH_INTERVAL", "5"))  # seconds
+# Scrapers authenticate with "Authorization: Bearer <METRICS_TOKEN>". Address
+# allow-listing only applies to requests that did not pass through a proxy
+# (behind nginx every request comes from 127.0.0.1), so it is empty by default.
+METRICS_TOKEN = env("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = env_list("METRICS_ALLOWED_IPS", "")
+
 # =========================
 # Logging (base defaults; prod can override)
 # =========================
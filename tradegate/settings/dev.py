@@ -4,3 +4,6 @@ DEBUG = True
 
 # Dev-friendly email (prints emails in console)
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+
+# Timing breakdown in the browser devtools for every request
+SERVER_TIMING_PUBLIC = True
@@ -29,6 +29,38 @@ if env_bool("DJANGO_SECURE_PROXY_SSL_HEADER", True):
 # Helps Django build correct absolute URLs behind reverse proxy
 USE_X_FORWARDED_HOST = env_bool("DJANGO_USE_X_FORWARDED_HOST", True)
 
+# =========================
+# Templates
+# =========================
+
+# Parse each template once per worker, whatever DEBUG/loader defaults apply.
+# (loaders and APP_DIRS are mutually exclusive.)
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
+# =========================
+# Static files (WhiteNoise)
+# =========================
+
+# collectstatic writes content-hashed copies plus .gz and .br variants
+# (brotli via the Brotli package). WhiteNoise serves hashed files with
+# "Cache-Control: max-age=315360000, public, immutable".
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+
+# Unhashed paths (e.g. /static/og-default.png linked from old shares)
+WHITENOISE_MAX_AGE = int(env("WHITENOISE_MAX_AGE", "3600"))
+
 # =========================
 # Hosts / CSRF
 # =========================
@@ -3,6 +3,8 @@ from django.http import HttpResponse
 from django.urls import include, path
 from django.contrib.sitemaps.views import sitemap
 
+from website.health import readiness_view
+from website.metrics import metrics_view, timing_view
 from website.sitemaps import StaticViewSitemap, LegalPageSitemap
 
 sitemaps = {
@@ -45,10 +47,12 @@ urlpatterns = [
 
     # Ops
     path("health/", healthcheck, name="healthcheck"),
+    path("ready/", readiness_view, name="readiness"),
+    path("metrics", metrics_view, name="metrics"),
+    path("metrics/timing", timing_view, name="metrics_timing"),
 
     # Website
     path("", include("website.urls")),
 
-    #test to triger deploy
+    # test to triger deploy
 ]
-
@@ -16,4 +16,8 @@ os.environ.setdefault(
 )
 
 application = get_wsgi_application()
-# tradegate/wsgi.py
\ No newline at end of file
+
+# URL resolver + compiled templates before the first request (DJANGO_WARMUP)
+from website.warmup import warm_on_startup  # noqa: E402
+
+warm_on_startup()
@@ -1,10 +1,18 @@
+import logging
+
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
 from django.contrib.auth.models import Group
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
-from django.http import HttpResponseRedirect
+from django.http import FileResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
 
+from . import export, search
+from .pagination import EstimatedCountPaginator, after_cursor, encode_cursor
 from .models import (
     SiteSettings,
     NavigationItem,
@@ -13,8 +21,11 @@ from .models import (
     ProcessStep,
     LegalPage,
     Inquiry,
+    OutboundEmail,
 )
 
+logger = logging.getLogger(__name__)
+
 # -------------------------
 # Hide clutter you don't use
 # -------------------------
@@ -47,7 +58,9 @@ class SiteSettingsAdmin(admin.ModelAdmin):
     fieldsets = (
         ("Brand", {"fields": ("site_name", "tagline", "brand_primary", "brand_accent", "brand_muted")}),
         ("Contact", {"fields": ("primary_email", "phone")}),
-        ("Address (optional)", {"fields": ("address", "address_line1", "address_line2", "postal_code", "city", "country")}),
+        ("Address (optional)", {
+            "fields": ("address", "address_line1", "address_line2", "postal_code", "city", "country"),
+        }),
         ("Social links (footer)", {"fields": ("facebook_url", "instagram_url", "x_url", "whatsapp_url")}),
         ("Homepage hero", {"fields": ("hero_title", "hero_subtitle", "hero_cta_label", "hero_cta_url")}),
         ("SEO defaults", {"fields": ("meta_title", "meta_description", "og_image_url")}),
@@ -146,10 +159,83 @@ class LegalPageAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
-
 # =========================
 # 5) Inquiries (Ops-ready)
 # =========================
+CURSOR_VAR = "cursor"
+
+
+class InquiryChangeList(ChangeList):
+    """
+    Ranked search results, and keyset pages ("Older »", ?cursor=) while the
+    list is in its default newest-first order (website.pagination).
+    """
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filter, sort and search links start again from the newest rows
+        if not new_params or CURSOR_VAR not in new_params:
+            remove = [*(remove or []), CURSOR_VAR]
+        return super().get_query_string(new_params, remove)
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        # Best match first, unless a column header was clicked. Not in
+        # get_ordering(): ChangeList orders before the search is applied.
+        if "search_rank" in queryset.query.annotations and ORDER_VAR not in self.params:
+            queryset = queryset.order_by("-search_rank", "-pk")
+        return queryset
+
+    @cached_property
+    def keyset(self) -> bool:
+        return (
+            ORDER_VAR not in self.params
+            and not self.show_all
+            and "search_rank" not in self.queryset.query.annotations
+        )
+
+    def get_results(self, request):
+        self.cursor = self.params.get(CURSOR_VAR, "") if self.keyset else ""
+        if not self.cursor:
+            return super().get_results(request)
+
+        # One LIMIT query from the cursor: no COUNT(*), no OFFSET page
+        try:
+            result_list = after_cursor(self.queryset, self.cursor)[: self.list_per_page]
+        except ValueError:
+            raise IncorrectLookupParameters
+        # Evaluated here; count() and the list_editable formset reuse the rows
+        self.result_count = len(result_list)
+        self.page_num = 1
+        self.result_list = result_list
+        self.full_result_count = None
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = bool(self.result_count)
+        self.can_show_all = False
+        self.multi_page = True
+        # Over this page only, so the pagination tag doesn't count the table
+        self.paginator = self.model_admin.get_paginator(request, result_list, self.list_per_page)
+
+    @cached_property
+    def next_cursor(self) -> str:
+        if not self.keyset or not self.multi_page:
+            return ""
+        rows = list(self.result_list)
+        if len(rows) < self.list_per_page:
+            return ""
+        return encode_cursor(rows[-1])
+
+    def newest_url(self) -> str:
+        return self.get_query_string(remove=[PAGE_VAR])
+
+    def older_url(self) -> str:
+        return self.get_query_string({CURSOR_VAR: self.next_cursor}, [PAGE_VAR])
+
+
 @admin.register(Inquiry)
 class InquiryAdmin(admin.ModelAdmin):
     list_display = ("created_at", "full_name", "email", "subject", "is_handled")
@@ -157,10 +243,16 @@ class InquiryAdmin(admin.ModelAdmin):
     search_fields = ("full_name", "email", "subject", "message", "company_name", "country")
     readonly_fields = ("created_at", "updated_at", "ip_address", "user_agent")
     list_editable = ("is_handled",)
-    date_hierarchy = "created_at"
     ordering = ("-created_at",)
 
-    actions = ("mark_handled", "mark_unhandled")
+    # No COUNT(*) of the whole table next to the filtered one, and planner
+    # estimates instead of exact counts for big results. date_hierarchy is
+    # gone too: its date buckets aggregate the table on every view; the
+    # created_at list filter covers the same ground.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    actions = ("mark_handled", "mark_unhandled", "export_csv", "export_jsonl", "export_xlsx")
 
     fieldsets = (
         ("Status", {"fields": ("is_handled",)}),
@@ -171,6 +263,15 @@ class InquiryAdmin(admin.ModelAdmin):
         ("System", {"fields": ("created_at", "updated_at", "ip_address", "user_agent")}),
     )
 
+    def get_changelist(self, request, **kwargs):
+        return InquiryChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        # Postgres: ranked full-text + trigram search; SQLite: search_fields
+        if search_term.strip() and search.enabled():
+            return search.search(queryset, search_term.strip()), False
+        return super().get_search_results(request, queryset, search_term)
+
     @admin.action(description="Mark selected inquiries as handled")
     def mark_handled(self, request, queryset):
         queryset.update(is_handled=True)
@@ -179,5 +280,85 @@ class InquiryAdmin(admin.ModelAdmin):
     def mark_unhandled(self, request, queryset):
         queryset.update(is_handled=False)
 
+    # Exports: the selected rows, or everything matching the current filters
+    # and search with "Select all". Streamed in chunks (website.export).
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if not export.xlsx_available():
+            actions.pop("export_xlsx", None)
+        return actions
+
+    def _export_filename(self, fmt):
+        return f"inquiries-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+
+    def _stream_export(self, request, queryset, fmt):
+        logger.info("Inquiry export (%s) by %s", fmt, request.user)
+        response = StreamingHttpResponse(
+            export.LINE_FORMATS[fmt](export.export_queryset(queryset)),
+            content_type=export.CONTENT_TYPES[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self._export_filename(fmt)}"'
+        return response
+
+    @admin.action(description="Export selected inquiries as CSV")
+    def export_csv(self, request, queryset):
+        return self._stream_export(request, queryset, "csv")
+
+    @admin.action(description="Export selected inquiries as JSON Lines")
+    def export_jsonl(self, request, queryset):
+        return self._stream_export(request, queryset, "jsonl")
+
+    @admin.action(description="Export selected inquiries as Excel (XLSX)")
+    def export_xlsx(self, request, queryset):
+        logger.info("Inquiry export (xlsx) by %s", request.user)
+        return FileResponse(
+            export.xlsx_file(export.export_queryset(queryset)),
+            as_attachment=True,
+            filename=self._export_filename("xlsx"),
+            content_type=export.CONTENT_TYPES["xlsx"],
+        )
 
 
+# =========================
+# 6) Outbound email queue
+# =========================
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "subject", "to", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "to", "last_error")
+    readonly_fields = (
+        "inquiry",
+        "subject",
+        "body",
+        "from_email",
+        "to",
+        "reply_to",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "last_error",
+        "sent_at",
+        "created_at",
+        "updated_at",
+    )
+    ordering = ("-created_at",)
+
+    actions = ("retry_now",)
+
+    fieldsets = (
+        ("Status", {"fields": ("status", "attempts", "next_attempt_at", "sent_at", "last_error")}),
+        ("Message", {"fields": ("inquiry", "subject", "from_email", "to", "reply_to", "body")}),
+        ("System", {"fields": ("created_at", "updated_at")}),
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Retry selected emails now")
+    def retry_now(self, request, queryset):
+        queryset.exclude(status=OutboundEmail.STATUS_SENT).update(
+            status=OutboundEmail.STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
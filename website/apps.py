@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class WebsiteConfig(AppConfig):
     name = "website"
+
+    def ready(self):
+        # Connect cache invalidation receivers
+        from . import signals  # noqa: F401
@@ -0,0 +1,102 @@
+"""
+Async versions of the public views, for the ASGI deployment (uvicorn).
+
+Enabled with DJANGO_ASYNC_VIEWS=true (see website/urls.py). Data is loaded
+with the async ORM and the settings/navigation memo (website.cache a*
+functions), so a worker does not park a thread per request while waiting
+on the database. Rendering stays sync (Django templates) and runs in the
+request's worker thread once every queryset has been evaluated.
+
+The POST side of the contact form runs its transaction in a worker thread
+(the async ORM has no atomic()); a synchronous email send is handed to a
+thread of its own so it never holds up the event loop.
+
+Contexts, messages and the email handling are website.views' own helpers:
+only the I/O differs.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+from django.shortcuts import render
+from django.views.decorators.http import require_http_methods
+
+from .cache import aget_site_settings, aprime_request
+from .conditional import conditional_page, home_stamp, legal_page_stamp, site_page_stamp
+from .forms import InquiryForm
+from .models import Service, Industry, ProcessStep, LegalPage
+from .page_cache import cache_public_page
+from .views import (
+    _about_context,
+    _contact_context,
+    _faq_context,
+    _home_context,
+    _inquiry_invalid,
+    _inquiry_received,
+    _legal_page_context,
+    _notify_inquiry,
+    _save_inquiry,
+)
+
+
+async def _render(request, template_name, context):
+    await aprime_request(request)
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@conditional_page(home_stamp)
+@cache_public_page
+async def home(request):
+    site = await aget_site_settings(request)
+
+    services = [s async for s in Service.objects.filter(is_active=True).order_by("order", "title")]
+    industries = [i async for i in Industry.objects.filter(is_active=True).order_by("order", "name")]
+    steps = [s async for s in ProcessStep.objects.all().order_by("order")]
+
+    return await _render(request, "website/home.html", _home_context(request, site, services, industries, steps))
+
+
+@conditional_page(legal_page_stamp)
+@cache_public_page
+async def legal_page(request, key):
+    try:
+        page = await LegalPage.objects.aget(key=key)
+    except LegalPage.DoesNotExist:
+        raise Http404("No LegalPage matches the given query.")
+    site = await aget_site_settings(request)
+
+    return await _render(request, "website/legal_page.html", _legal_page_context(request, site, page))
+
+
+@require_http_methods(["GET", "POST"])
+async def contact(request):
+    site = await aget_site_settings(request)
+
+    if request.method == "POST":
+        form = InquiryForm(request.POST)
+
+        if form.is_valid():
+            use_outbox = getattr(settings, "EMAIL_OUTBOX_ENABLED", False)
+            inquiry, msg = await sync_to_async(_save_inquiry)(request, form, site, use_outbox)
+            # Own thread: a slow SMTP relay must not block other requests
+            email_sent = await sync_to_async(_notify_inquiry, thread_sensitive=False)(inquiry, msg, use_outbox)
+            return _inquiry_received(request, email_sent)
+
+        _inquiry_invalid(request, form)
+
+    else:
+        form = InquiryForm()
+
+    return await _render(request, "website/contact.html", _contact_context(request, form))
+
+
+@conditional_page(site_page_stamp)
+@cache_public_page
+async def about(request):
+    return await _render(request, "website/about.html", _about_context(request))
+
+
+@conditional_page(site_page_stamp)
+@cache_public_page
+async def faq(request):
+    return await _render(request, "website/faq.html", _faq_context(request))
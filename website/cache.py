@@ -0,0 +1,335 @@
+"""
+Process-local caches for rows that change a few times a year.
+
+SiteSettings and the header navigation are read on every request (context
+processor + views), but only change when someone edits them in the admin. We
+keep them in worker memory and drop them when a save/delete signal bumps
+their version.
+
+Versions:
+- Every cached value is tied to a named version ("site_settings", ...).
+- bump_version(name) forgets the local copy immediately and publishes a new
+  version token in the Django cache.
+- With SITE_CACHE_SHARED_VERSIONS on, process memos also compare that token,
+  so the other gunicorn workers notice the bump on their next request.
+- Without it (no shared L2 cache) a worker can't see another worker's bump,
+  so process memos only live SITE_CACHE_LOCAL_TTL seconds: an admin edit
+  reaches every worker within that time.
+- Data stored in the Django cache itself (pages, template fragments) is keyed
+  on cache_version(name), which is always the shared token.
+
+The a*-prefixed functions are the same for async views: they await the
+Django cache and the async ORM instead of blocking the event loop.
+
+Returned objects are shared between requests: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+from .models import NavigationItem, SiteSettings
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "website:version:{}"
+
+SITE_SETTINGS = "site_settings"
+NAVIGATION = "navigation"
+CONTENT = "content"  # anything rendered into public pages (conditional GET, fragments)
+CHROME = "chrome"  # header/footer: SiteSettings + NavigationItem
+PAGES = "pages"  # full-page cache (website.page_cache)
+
+_lock = threading.Lock()
+
+# name -> (version, value, expires); expires is a time.monotonic() deadline or None
+_memo: dict[str, tuple[Any, Any, float | None]] = {}
+
+# name -> local generation; bumped in-process so loads racing a save are dropped
+_generations: dict[str, int] = {}
+
+_MISSING = object()
+
+
+def _shared_versions_enabled() -> bool:
+    return getattr(settings, "SITE_CACHE_SHARED_VERSIONS", False)
+
+
+def _local_ttl() -> float | None:
+    if _shared_versions_enabled():
+        return None
+    return getattr(settings, "SITE_CACHE_LOCAL_TTL", 5)
+
+
+def _shared_version(name: str):
+    if not _shared_versions_enabled():
+        return None
+    try:
+        return cache.get(VERSION_KEY.format(name))
+    except Exception:
+        # A broken cache must never take the site down; fall back to local state.
+        logger.exception("Could not read cache version for %s", name)
+        return None
+
+
+async def _ashared_version(name: str):
+    if not _shared_versions_enabled():
+        return None
+    try:
+        return await cache.aget(VERSION_KEY.format(name))
+    except Exception:
+        logger.exception("Could not read cache version for %s", name)
+        return None
+
+
+def _generation(name: str) -> int:
+    with _lock:
+        return _generations.get(name, 0)
+
+
+def get_version(name: str) -> tuple[int, Any]:
+    """
+    Current version of a named cache: (local generation, shared version).
+    """
+    return _generation(name), _shared_version(name)
+
+
+async def aget_version(name: str) -> tuple[int, Any]:
+    return _generation(name), await _ashared_version(name)
+
+
+def bump_version(name: str) -> None:
+    """
+    Invalidate a named cache in this process and publish a new shared version.
+    """
+    with _lock:
+        _generations[name] = _generations.get(name, 0) + 1
+        _memo.pop(name, None)
+
+    try:
+        cache.set(VERSION_KEY.format(name), uuid.uuid4().hex, None)
+    except Exception:
+        logger.exception("Could not publish cache version for %s", name)
+
+
+def cache_version(name: str) -> str:
+    """
+    Shared version token of a named cache, for keys of data in the Django cache.
+    """
+    key = VERSION_KEY.format(name)
+    try:
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid.uuid4().hex, None)
+            version = cache.get(key)
+    except Exception:
+        logger.exception("Could not read cache version for %s", name)
+        version = None
+    # Unreachable cache: a throwaway version means "nothing cached", never stale.
+    return version or uuid.uuid4().hex
+
+
+async def acache_version(name: str) -> str:
+    key = VERSION_KEY.format(name)
+    try:
+        version = await cache.aget(key)
+        if version is None:
+            await cache.aadd(key, uuid.uuid4().hex, None)
+            version = await cache.aget(key)
+    except Exception:
+        logger.exception("Could not read cache version for %s", name)
+        version = None
+    return version or uuid.uuid4().hex
+
+
+def memoize(name: str, loader: Callable[[], Any], version_of: str | None = None) -> Any:
+    """
+    Return the value cached under `name`, calling `loader()` when it is stale.
+
+    `version_of` ties the entry to another named version (default: `name`),
+    e.g. many template fragments invalidated by the one "content" version.
+    """
+    version_name = version_of or name
+    version = get_version(version_name)
+
+    value = _lookup(name, version)
+    if value is _MISSING:
+        value = loader()
+        _store(name, version_name, version, value)
+    return value
+
+
+async def amemoize(name: str, loader: Callable[[], Awaitable[Any]], version_of: str | None = None) -> Any:
+    """
+    memoize() with an async loader.
+    """
+    version_name = version_of or name
+    version = await aget_version(version_name)
+
+    value = _lookup(name, version)
+    if value is _MISSING:
+        value = await loader()
+        _store(name, version_name, version, value)
+    return value
+
+
+def _lookup(name: str, version) -> Any:
+    with _lock:
+        entry = _memo.get(name)
+    if entry is not None and entry[0] == version and (entry[2] is None or time.monotonic() < entry[2]):
+        metrics.inc("tradegate_cache_requests_total", cache="memo", result="hit")
+        return entry[1]
+    metrics.inc("tradegate_cache_requests_total", cache="memo", result="miss")
+    return _MISSING
+
+
+def _store(name: str, version_name: str, version, value) -> None:
+    ttl = _local_ttl()
+    expires = time.monotonic() + ttl if ttl is not None else None
+    with _lock:
+        # Only keep the value if nobody bumped the version while we were loading.
+        if _generations.get(version_name, 0) == version[0]:
+            _memo[name] = (version, value, expires)
+
+
+def clear_local() -> None:
+    """
+    Forget everything cached in this process (tests, management commands).
+    """
+    with _lock:
+        _memo.clear()
+        for name in list(_generations):
+            _generations[name] += 1
+
+
+def request_memo(request, name: str, loader: Callable[[], Any]) -> Any:
+    # Per-request memo: one lookup per request even if the process memo is
+    # invalidated halfway through rendering.
+    if request is None:
+        return loader()
+
+    store = request.__dict__.setdefault("_website_cache", {})
+    value = store.get(name, _MISSING)
+    if value is _MISSING:
+        value = store[name] = loader()
+    return value
+
+
+async def arequest_memo(request, name: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    # Same store as request_memo(), so sync code later in the request
+    # (context processors) finds what the async view loaded.
+    if request is None:
+        return await loader()
+
+    store = request.__dict__.setdefault("_website_cache", {})
+    value = store.get(name, _MISSING)
+    if value is _MISSING:
+        value = store[name] = await loader()
+    return value
+
+
+# =========================
+# Site settings
+# =========================
+def _load_site_settings():
+    return SiteSettings.objects.first()
+
+
+async def _aload_site_settings():
+    return await SiteSettings.objects.afirst()
+
+
+def get_site_settings(request=None):
+    """
+    The SiteSettings row (or None), cached per process and per request.
+    """
+    return request_memo(
+        request,
+        SITE_SETTINGS,
+        lambda: memoize(SITE_SETTINGS, _load_site_settings),
+    )
+
+
+async def aget_site_settings(request=None):
+    return await arequest_memo(
+        request,
+        SITE_SETTINGS,
+        lambda: amemoize(SITE_SETTINGS, _aload_site_settings),
+    )
+
+
+# =========================
+# Navigation
+# =========================
+class NavLink(NamedTuple):
+    label: str
+    href: str
+    is_cta: bool
+
+
+class Navigation(NamedTuple):
+    items: tuple[NavLink, ...]
+    cta: NavLink | None
+
+
+EMPTY_NAVIGATION = Navigation(items=(), cta=None)
+
+
+def _visible_navigation():
+    return NavigationItem.objects.filter(is_visible=True).order_by("order", "label")
+
+
+def _navigation(rows) -> Navigation:
+    # Resolve hrefs once here so templates never call reverse().
+    items = tuple(NavLink(label=item.label, href=item.get_href(), is_cta=item.is_cta) for item in rows)
+    cta = next((item for item in items if item.is_cta), None)
+    return Navigation(items=items, cta=cta)
+
+
+def _load_navigation() -> Navigation:
+    return _navigation(_visible_navigation())
+
+
+async def _aload_navigation() -> Navigation:
+    return _navigation([item async for item in _visible_navigation()])
+
+
+def get_navigation(request=None) -> Navigation:
+    """
+    Visible navigation links with resolved hrefs, cached per process and per request.
+    """
+    return request_memo(
+        request,
+        NAVIGATION,
+        lambda: memoize(NAVIGATION, _load_navigation),
+    )
+
+
+async def aget_navigation(request=None) -> Navigation:
+    return await arequest_memo(
+        request,
+        NAVIGATION,
+        lambda: amemoize(NAVIGATION, _aload_navigation),
+    )
+
+
+async def aprime_request(request) -> None:
+    """
+    Load what the site_settings context processor needs without blocking,
+    so rendering a page from an async view does no I/O for the chrome.
+    """
+    await aget_site_settings(request)
+    try:
+        await aget_navigation(request)
+    except Exception:
+        # The context processor retries and falls back to no links
+        pass
+    await arequest_memo(request, CHROME, lambda: acache_version(CHROME))
@@ -0,0 +1,182 @@
+"""
+Two-tier read-through cache backend.
+
+    L1: per-process LocMemCache (bounded by MAX_ENTRIES, LRU eviction)
+    L2: shared between workers (FileBasedCache or RedisCache)
+
+Reads try L1, then L2, and copy L2 hits into L1. Writes go to both tiers.
+If L2 is unreachable (Redis down, disk full) the error is logged and the
+cache carries on with L1 alone, so an outage costs hit rate, not pages.
+L1 copies live for at most L1_TIMEOUT seconds; L1_KEY_TIMEOUTS overrides that
+per key prefix (longest prefix wins), e.g. version keys get a very short L1
+life so a bump in one worker is seen by the others within seconds.
+
+Configured in settings.CACHES (see CACHE_L2 in tradegate/settings/base.py):
+
+    "default": {
+        "BACKEND": "website.cache_backends.TieredCache",
+        "OPTIONS": {
+            "L1": "local",
+            "L2": "shared",
+            "L1_TIMEOUT": 30,
+            "L1_KEY_TIMEOUTS": {"website:version:": 2},
+        },
+    }
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:
+    L2_ERRORS: tuple[type[Exception], ...] = (OSError,)
+else:
+    L2_ERRORS = (OSError, RedisError)
+
+# Log an unreachable L2 at most this often (every request would hit it)
+L2_ERROR_LOG_INTERVAL = 10.0
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+
+        self._l1_alias = options.get("L1", "local")
+        self._l2_alias = options.get("L2", "shared")
+        if self._l1_alias == self._l2_alias:
+            raise ImproperlyConfigured("TieredCache needs two different cache aliases for L1 and L2.")
+
+        self._l1_timeout = options.get("L1_TIMEOUT", 30)
+        self._l2_error_logged = float("-inf")
+        # Longest prefix first, so the most specific rule wins
+        self._key_timeouts = sorted(
+            options.get("L1_KEY_TIMEOUTS", {}).items(),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    @cached_property
+    def l1(self) -> BaseCache:
+        return caches[self._l1_alias]
+
+    @cached_property
+    def l2(self) -> BaseCache:
+        return caches[self._l2_alias]
+
+    def _l2(self, operation, fallback, *args, **kwargs):
+        """
+        Call `operation` on L2; on a backend error, log it and return fallback.
+        """
+        try:
+            return getattr(self.l2, operation)(*args, **kwargs)
+        except L2_ERRORS:
+            now = time.monotonic()
+            if now - self._l2_error_logged >= L2_ERROR_LOG_INTERVAL:
+                self._l2_error_logged = now
+                logger.warning("L2 cache %r failed on %s; using L1 only", self._l2_alias, operation, exc_info=True)
+            return fallback
+
+    def _l1_ttl(self, key, timeout=DEFAULT_TIMEOUT):
+        ttl = next(
+            (seconds for prefix, seconds in self._key_timeouts if str(key).startswith(prefix)),
+            self._l1_timeout,
+        )
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return ttl
+        return min(timeout, ttl)
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def get(self, key, default=None, version=None):
+        value = self.l1.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            return value
+
+        value = self._l2("get", _MISSING, key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+
+        self.l1.set(key, value, self._l1_ttl(key), version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = self.l1.get_many(keys, version=version)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            from_l2 = self._l2("get_many", {}, missing, version=version)
+            for key, value in from_l2.items():
+                self.l1.set(key, value, self._l1_ttl(key), version=version)
+            found.update(from_l2)
+        return found
+
+    def has_key(self, key, version=None):
+        return self.l1.has_key(key, version=version) or self._l2("has_key", False, key, version=version)
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._l2("set", None, key, value, timeout, version=version)
+        self.l1.set(key, value, self._l1_ttl(key, timeout), version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self._l2("set_many", [], data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self.l1.set(key, value, self._l1_ttl(key, timeout), version=version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self._l2("add", _MISSING, key, value, timeout, version=version)
+        if added is _MISSING:
+            return self.l1.add(key, value, self._l1_ttl(key, timeout), version=version)
+        if added:
+            self.l1.set(key, value, self._l1_ttl(key, timeout), version=version)
+        else:
+            # Another worker owns the value; read it from L2 next time.
+            self.l1.delete(key, version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l1.delete(key, version=version)
+        return self._l2("touch", False, key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self._l2("incr", _MISSING, key, delta, version=version)
+        if value is _MISSING:
+            return self.l1.incr(key, delta, version=version)
+        self.l1.delete(key, version=version)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        value = self._l2("decr", _MISSING, key, delta, version=version)
+        if value is _MISSING:
+            return self.l1.decr(key, delta, version=version)
+        self.l1.delete(key, version=version)
+        return value
+
+    def delete(self, key, version=None):
+        deleted = self.l1.delete(key, version=version)
+        return self._l2("delete", deleted, key, version=version)
+
+    def delete_many(self, keys, version=None):
+        self.l1.delete_many(keys, version=version)
+        self._l2("delete_many", None, keys, version=version)
+
+    def clear(self):
+        self.l1.clear()
+        self._l2("clear", None)
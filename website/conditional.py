@@ -0,0 +1,137 @@
+"""
+Conditional GET (ETag / Last-Modified / 304) for the public pages.
+
+Every content model carries updated_at. We collect max(updated_at) and the
+row count per model once per content version (see website.cache), so
+answering If-None-Match / If-Modified-Since costs no queries in steady state.
+Without shared versions, a worker can't see another worker's edit, so the
+stamps are reloaded every SITE_CACHE_LOCAL_TTL seconds instead.
+
+The row count is part of the ETag because deleting a row does not move
+max(updated_at). RELEASE_ID (the deployed git commit by default) is part of
+it because a deploy can change the templates without touching any row.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from . import cache
+from .models import SiteSettings, NavigationItem, Service, Industry, ProcessStep, LegalPage
+
+# Every page renders base.html (settings + navigation)
+SITE_CHROME = (SiteSettings, NavigationItem)
+
+HOME_MODELS = SITE_CHROME + (Service, Industry, ProcessStep)
+
+
+def _load_stamps() -> dict:
+    stamps = {}
+    for model in HOME_MODELS:
+        agg = model.objects.aggregate(last=Max("updated_at"), count=Count("pk"))
+        stamps[model] = (agg["last"], agg["count"])
+    stamps[LegalPage] = {
+        key: (updated_at, 1)
+        for key, updated_at in LegalPage.objects.values_list("key", "updated_at")
+    }
+    return stamps
+
+
+def content_stamps() -> dict:
+    """
+    {model: (max updated_at, row count)}; LegalPage maps key -> stamp.
+    """
+    return cache.memoize(cache.CONTENT, _load_stamps)
+
+
+def _combine(parts, request) -> tuple[datetime | None, str]:
+    dates = [last for last, _ in parts if last is not None]
+    last_modified = max(dates) if dates else None
+
+    raw = "|".join(
+        [getattr(settings, "RELEASE_ID", ""), request.path, str(timezone.now().year)]
+        + [f"{last.isoformat() if last else '-'}:{count}" for last, count in parts]
+    )
+    return last_modified, hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def site_page_stamp(request, *args, **kwargs):
+    stamps = content_stamps()
+    return _combine([stamps[model] for model in SITE_CHROME], request)
+
+
+def home_stamp(request, *args, **kwargs):
+    stamps = content_stamps()
+    return _combine([stamps[model] for model in HOME_MODELS], request)
+
+
+def legal_page_stamp(request, key, *args, **kwargs):
+    stamps = content_stamps()
+    page = stamps[LegalPage].get(key)
+    if page is None:
+        # Unknown key: let the view answer 404
+        return None
+    return _combine([stamps[model] for model in SITE_CHROME] + [page], request)
+
+
+def conditional_page(stamp_func):
+    """
+    Answer If-None-Match / If-Modified-Since with 304 from `stamp_func`.
+
+    Responses are marked no-cache so browsers revalidate instead of guessing
+    a freshness lifetime from Last-Modified.
+
+    Works on async views too: the stamp (which may query the database) is
+    computed in a worker thread before condition() looks at it.
+    """
+
+    def stamp(request, *args, **kwargs):
+        # condition() asks for the ETag and Last-Modified separately
+        if "_page_stamp" not in request.__dict__:
+            request._page_stamp = stamp_func(request, *args, **kwargs)
+        return request._page_stamp
+
+    def etag(request, *args, **kwargs):
+        value = stamp(request, *args, **kwargs)
+        return value[1] if value else None
+
+    def last_modified(request, *args, **kwargs):
+        value = stamp(request, *args, **kwargs)
+        return value[0] if value else None
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def _ano_cache(request, *args, **kwargs):
+                response = await view(request, *args, **kwargs)
+                patch_cache_control(response, no_cache=True)
+                return response
+
+            conditional = condition(etag_func=etag, last_modified_func=last_modified)(_ano_cache)
+
+            @wraps(view)
+            async def _with_stamp(request, *args, **kwargs):
+                await sync_to_async(stamp)(request, *args, **kwargs)
+                return await conditional(request, *args, **kwargs)
+
+            return _with_stamp
+
+        @wraps(view)
+        def _no_cache(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            patch_cache_control(response, no_cache=True)
+            return response
+
+        return condition(etag_func=etag, last_modified_func=last_modified)(_no_cache)
+
+    return decorator
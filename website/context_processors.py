@@ -2,36 +2,35 @@ from __future__ import annotations
 
 from typing import Any
 
-from .models import SiteSettings
+from django.conf import settings
 
-# Navigation model may not exist yet (or migrations not applied yet).
-# We import it safely to avoid breaking the project.
-try:
-    from .models import NavigationItem  # type: ignore
-except Exception:
-    NavigationItem = None  # type: ignore
+from .cache import (
+    CHROME,
+    EMPTY_NAVIGATION,
+    cache_version,
+    get_navigation,
+    get_site_settings,
+    request_memo,
+)
 
 
 def site_settings(request) -> dict[str, Any]:
-    site = SiteSettings.objects.first()
+    site = get_site_settings(request)
 
-    nav_items = []
-    nav_cta = None
-
-    # NavigationItem is optional until you add the model and run migrations.
-    # If not available yet, nav_items stays empty and templates can fall back.
-    if NavigationItem is not None:
-        try:
-            qs = NavigationItem.objects.filter(is_visible=True).order_by("order", "label")
-            nav_cta = qs.filter(is_cta=True).first()
-            nav_items = list(qs)
-        except Exception:
-            nav_items = []
-            nav_cta = None
+    # Navigation is resolved once per process (label, href, CTA flag).
+    # If the table is missing (migrations not applied yet), nav_items stays
+    # empty and templates fall back to the static links.
+    try:
+        nav = get_navigation(request)
+    except Exception:
+        nav = EMPTY_NAVIGATION
 
     return {
         "site": site,
         "site_name": (site.site_name if site and site.site_name else "TradeGate"),
-        "nav_items": nav_items,
-        "nav_cta": nav_cta,  # NEW: lets base.html render a single CTA button cleanly
+        "nav_items": nav.items,
+        "nav_cta": nav.cta,  # lets base.html render a single CTA button cleanly
+        # {% cache %} keys for the header/footer; bumped when settings/nav change
+        "chrome_version": request_memo(request, CHROME, lambda: cache_version(CHROME)),
+        "fragment_cache_timeout": getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 86400),
     }
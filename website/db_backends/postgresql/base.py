@@ -0,0 +1,45 @@
+"""
+Django's postgresql backend with connection metrics (website.metrics).
+
+    ENGINE: "website.db_backends.postgresql"
+
+- tradegate_db_connect_seconds: time to open a new connection (TCP/TLS and
+  login, to Postgres or pgbouncer), by DB_POOL_MODE
+- tradegate_db_connections_total: connections obtained, failed, or dropped
+  because the health check found them unusable
+
+Everything else is the stock backend; see DB_POOL_MODE in
+tradegate/settings/base.py.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.db.backends.postgresql import base
+
+from website import metrics
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def _pool_mode(self) -> str:
+        return getattr(settings, "DB_POOL_MODE", "persistent")
+
+    def get_new_connection(self, conn_params):
+        start = time.perf_counter()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Exception:
+            metrics.inc("tradegate_db_connections_total", result="failed", mode=self._pool_mode)
+            raise
+        metrics.observe("tradegate_db_connect_seconds", time.perf_counter() - start, mode=self._pool_mode)
+        metrics.inc("tradegate_db_connections_total", result="opened", mode=self._pool_mode)
+        return connection
+
+    def is_usable(self):
+        usable = super().is_usable()
+        if not usable:
+            metrics.inc("tradegate_db_connections_total", result="unusable", mode=self._pool_mode)
+        return usable
@@ -0,0 +1,181 @@
+"""
+Inquiry export as CSV, JSON Lines or XLSX, in constant memory.
+
+Rows are read with .only(EXPORT_FIELDS) and QuerySet.iterator(chunk_size),
+so at most one chunk of model instances is alive at a time, and written out
+line by line: the admin action streams them (StreamingHttpResponse), and
+`manage.py export_inquiries` writes them to a file or stdout.
+
+Everything in an inquiry is typed by a visitor, so text that a spreadsheet
+would run as a formula (=, +, -, @) is defused: CSV cells get a leading
+apostrophe, XLSX cells are written as plain strings.
+
+XLSX needs openpyxl (`pip install openpyxl`) and is written in its
+write-only mode to a temporary file: a zip can't be streamed while it is
+being built, but memory still stays flat.
+
+Incremental exports: rows are read oldest first, and the position after
+the last row is a cursor (created_at, id, see website.pagination) that the
+next export continues from.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import tempfile
+
+from django.conf import settings
+from django.db.models import Q
+
+from .pagination import decode_cursor, encode_cursor
+
+EXPORT_FIELDS = (
+    "id",
+    "created_at",
+    "full_name",
+    "email",
+    "phone",
+    "contact_method",
+    "company_name",
+    "website",
+    "country",
+    "service_interest",
+    "timeline",
+    "budget_range",
+    "subject",
+    "message",
+    "consent",
+    "is_handled",
+)
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _chunk_size() -> int:
+    return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+
+def export_queryset(queryset, cursor: str = ""):
+    """
+    queryset projected to EXPORT_FIELDS, oldest first, after cursor if given.
+    """
+    queryset = queryset.only(*EXPORT_FIELDS).order_by("created_at", "id")
+    if cursor:
+        stamp, pk = decode_cursor(cursor)
+        # The redundant >= gives the planner an index bound to start from
+        queryset = queryset.filter(created_at__gte=stamp).filter(
+            Q(created_at__gt=stamp) | Q(created_at=stamp, pk__gt=pk)
+        )
+    return queryset
+
+
+class Progress:
+    """
+    Rows written so far and the cursor after the last one.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last = None
+
+    @property
+    def cursor(self) -> str:
+        return encode_cursor(self.last) if self.last is not None else ""
+
+
+def rows(queryset, chunk_size: int | None = None, progress: Progress | None = None):
+    """
+    Yield one tuple of EXPORT_FIELDS values per inquiry.
+    """
+    for inquiry in queryset.iterator(chunk_size=chunk_size or _chunk_size()):
+        if progress is not None:
+            progress.count += 1
+            progress.last = inquiry
+        yield tuple(getattr(inquiry, field) for field in EXPORT_FIELDS)
+
+
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    value = _value(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Echo:
+    # csv.writer wants a file; this one hands each line back to the caller
+    def write(self, value):
+        return value
+
+
+def csv_lines(queryset, chunk_size: int | None = None, progress: Progress | None = None):
+    writer = csv.writer(_Echo())
+    # BOM so Excel opens it as UTF-8
+    yield "\ufeff" + writer.writerow(EXPORT_FIELDS)
+    for row in rows(queryset, chunk_size, progress):
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def jsonl_lines(queryset, chunk_size: int | None = None, progress: Progress | None = None):
+    for row in rows(queryset, chunk_size, progress):
+        yield json.dumps(dict(zip(EXPORT_FIELDS, map(_value, row))), ensure_ascii=False) + "\n"
+
+
+LINE_FORMATS = {"csv": csv_lines, "jsonl": jsonl_lines}
+
+
+def write_xlsx(queryset, fh, chunk_size: int | None = None, progress: Progress | None = None) -> None:
+    """
+    Write queryset as an XLSX workbook to the binary file fh (needs openpyxl).
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    def cell(value):
+        if hasattr(value, "tzinfo"):
+            # Excel has no time zones: timestamps are written as UTC
+            return value.replace(tzinfo=None)
+        if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+            # openpyxl would store "=..." as a formula
+            text = WriteOnlyCell(sheet, value)
+            text.data_type = "s"
+            return text
+        return value
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Inquiries")
+    sheet.append(EXPORT_FIELDS)
+    for row in rows(queryset, chunk_size, progress):
+        sheet.append([cell(value) for value in row])
+    workbook.save(fh)
+
+
+def xlsx_file(queryset, chunk_size: int | None = None):
+    """
+    The workbook in a temporary file, rewound, for FileResponse.
+    """
+    fh = tempfile.TemporaryFile()
+    write_xlsx(queryset, fh, chunk_size)
+    fh.seek(0)
+    return fh
+
+
+def xlsx_available() -> bool:
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,170 @@
+"""
+Readiness probe (/ready/) for the load balancer.
+
+/health/ only says the process answers. /ready/ checks what a request needs:
+
+- database: SELECT 1
+- cache:    set / get / delete of a throwaway key on the default cache
+- smtp:     NOOP on the mail relay (only with READINESS_CHECK_SMTP)
+
+The checks run in parallel and the whole probe is bounded by
+READINESS_TIMEOUT; a check that has not answered by then counts as failed.
+The result is kept for READINESS_CACHE_SECONDS and concurrent probes wait
+for the one already running, so a burst of probes costs one round of checks.
+
+Answers 200 when every check passed, 503 otherwise, with per-check latency:
+
+    {"status": "ok", "cached": false,
+     "checks": {"database": {"ok": true, "ms": 0.8}, ...}}
+
+The endpoint is public, so why a check failed only goes to the log; the
+response just says it failed, or "timeout": true when it didn't answer.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.db import close_old_connections, connection
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="readiness")
+
+_lock = threading.Lock()
+_result: dict | None = None
+_expires = 0.0
+_running: threading.Event | None = None
+
+
+# =========================
+# Checks
+# =========================
+def check_database() -> None:
+    # Runs in a pool thread, which has its own connection: nothing else in
+    # that thread would ever close it
+    close_old_connections()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    finally:
+        connection.close()
+
+
+def check_cache() -> None:
+    key = f"website:ready:{uuid.uuid4().hex}"
+    cache.set(key, "1", 10)
+    try:
+        if cache.get(key) != "1":
+            raise RuntimeError("value written to the cache could not be read back")
+    finally:
+        cache.delete(key)
+
+
+def check_smtp() -> None:
+    mail = get_connection(fail_silently=False, timeout=getattr(settings, "READINESS_TIMEOUT", 2.0))
+    if not hasattr(mail, "connection"):
+        # Not the SMTP backend (console, locmem, ...): nothing to probe
+        return
+    mail.open()
+    try:
+        code, _ = mail.connection.noop()
+        if code != 250:
+            raise RuntimeError(f"SMTP NOOP answered {code}")
+    finally:
+        mail.close()
+
+
+def _checks() -> dict:
+    checks = {"database": check_database, "cache": check_cache}
+    if getattr(settings, "READINESS_CHECK_SMTP", False):
+        checks["smtp"] = check_smtp
+    return checks
+
+
+def _timed(name: str, check) -> dict:
+    start = time.perf_counter()
+    try:
+        check()
+    except Exception:
+        logger.warning("Readiness check %s failed", name, exc_info=True)
+        return {"ok": False, "ms": _ms(start)}
+    return {"ok": True, "ms": _ms(start)}
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def run_checks() -> dict:
+    """
+    Run every check in parallel, bounded by READINESS_TIMEOUT in total.
+    """
+    timeout = getattr(settings, "READINESS_TIMEOUT", 2.0)
+    futures = {name: _executor.submit(_timed, name, check) for name, check in _checks().items()}
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        if future.done():
+            results[name] = future.result()
+        else:
+            future.cancel()
+            results[name] = {"ok": False, "ms": round(timeout * 1000, 1), "timeout": True}
+
+    ok = all(result["ok"] for result in results.values())
+    if not ok:
+        logger.warning("Readiness check failed: %s", {n: r for n, r in results.items() if not r["ok"]})
+    return {"status": "ok" if ok else "fail", "checks": results}
+
+
+def readiness() -> tuple[dict, bool]:
+    """
+    Latest readiness result and whether it came from the short-lived cache.
+    """
+    global _result, _expires, _running
+
+    with _lock:
+        if _result is not None and time.monotonic() < _expires:
+            return _result, True
+        running = _running
+        if running is None:
+            running = _running = threading.Event()
+            owner = True
+        else:
+            owner = False
+
+    if not owner:
+        # Someone else is probing right now; share their answer.
+        running.wait(getattr(settings, "READINESS_TIMEOUT", 2.0) + 1)
+        with _lock:
+            if _result is not None and time.monotonic() < _expires:
+                return _result, True
+        return run_checks(), False
+
+    try:
+        result = run_checks()
+        with _lock:
+            _result = result
+            _expires = time.monotonic() + getattr(settings, "READINESS_CACHE_SECONDS", 3)
+    finally:
+        with _lock:
+            _running = None
+        running.set()
+    return result, False
+
+
+def readiness_view(request):
+    result, cached = readiness()
+    response = JsonResponse({**result, "cached": cached}, status=200 if result["status"] == "ok" else 503)
+    response["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,90 @@
+"""
+Render time per public page, with static fragments off (before) and on (after).
+
+Views are called directly with a RequestFactory request, so the numbers are
+view + context processors + template rendering, without middleware or
+network. Run it with the settings you deploy (prod.py uses the cached loader):
+
+    DJANGO_SETTINGS_MODULE=tradegate.settings.prod python manage.py bench_templates
+"""
+
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+
+from website import cache
+from website.models import LegalPage
+from website.timing import percentile
+
+
+class Command(BaseCommand):
+    help = "Benchmark page render time with and without pre-rendered static fragments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--json", dest="json_path", default="", help="Also write results to this file.")
+
+    def _paths(self):
+        paths = ["/", "/about/", "/faq/", "/contact/"]
+        paths += [page.get_absolute_url() for page in LegalPage.objects.all()]
+        return paths
+
+    def _time(self, path, iterations, warmup):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and "*" not in h), "localhost").lstrip(".")
+        factory = RequestFactory(HTTP_HOST=host)
+        match = resolve(path)
+
+        samples = []
+        for i in range(warmup + iterations):
+            request = factory.get(path)
+            request.user = AnonymousUser()
+            start = time.perf_counter()
+            response = match.func(request, *match.args, **match.kwargs)
+            elapsed = time.perf_counter() - start
+            if i >= warmup:
+                samples.append(elapsed * 1000)
+
+        ordered = sorted(samples)
+        return {
+            "status": response.status_code,
+            "bytes": len(response.content),
+            "mean_ms": round(statistics.fmean(samples), 3),
+            "p50_ms": round(percentile(ordered, 0.50), 3),
+            "p95_ms": round(percentile(ordered, 0.95), 3),
+        }
+
+    def handle(self, *args, **options):
+        loaders = settings.TEMPLATES[0]["OPTIONS"].get("loaders")
+        self.stdout.write(f"Template loaders: {loaders or 'default (APP_DIRS)'}; DEBUG={settings.DEBUG}")
+
+        results = {}
+        for mode, fragments in (("before", False), ("after", True)):
+            with override_settings(TEMPLATE_STATIC_FRAGMENTS=fragments, PAGE_CACHE_ENABLED=False):
+                cache.clear_local()
+                results[mode] = {
+                    path: self._time(path, options["iterations"], options["warmup"])
+                    for path in self._paths()
+                }
+
+        header = f"{'page':<28}{'before p50':>12}{'after p50':>12}{'before p95':>12}{'after p95':>12}{'speedup':>9}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for path, before in results["before"].items():
+            after = results["after"][path]
+            speedup = before["p50_ms"] / after["p50_ms"] if after["p50_ms"] else 0
+            self.stdout.write(
+                f"{path:<28}{before['p50_ms']:>10.2f}ms{after['p50_ms']:>10.2f}ms"
+                f"{before['p95_ms']:>10.2f}ms{after['p95_ms']:>10.2f}ms{speedup:>8.2f}x"
+            )
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Wrote {options['json_path']}")
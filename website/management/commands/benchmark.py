@@ -0,0 +1,499 @@
+"""
+Throughput and latency of every public URL against a seeded throwaway database.
+
+    python manage.py benchmark                       # Django test client
+    python manage.py benchmark --mode gunicorn --workers 3 --concurrency 8
+    python manage.py benchmark --mode gunicorn uvicorn --concurrency 32   # sync vs async
+    python manage.py benchmark --mode client gunicorn --output bench/$(git rev-parse --short HEAD).json
+
+The database is created like a test database (test_<name>, or a temporary
+SQLite file), seeded with realistic content and --inquiries Inquiry rows,
+and dropped afterwards. Nothing touches the real database.
+
+- client:   requests go through the Django test client in this process
+            (full middleware stack, no network or WSGI server).
+- gunicorn: a local gunicorn (WSGI, sync views) is started on a free port
+            against the same database and hit from --concurrency threads
+            over HTTP.
+- uvicorn:  the same with uvicorn serving tradegate.asgi and the async views
+            (DJANGO_ASYNC_VIEWS=true). With both servers, a sync-vs-async
+            throughput comparison is printed at the end.
+
+Results are written as JSON (--output) together with the git commit, so
+two runs can be diffed. Run with the settings you deploy:
+
+    DJANGO_SETTINGS_MODULE=tradegate.settings.prod python manage.py benchmark
+"""
+
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from website import cache, release
+from website.forms import SERVICE_CHOICES
+from website.models import (
+    Industry,
+    Inquiry,
+    LegalPage,
+    NavigationItem,
+    ProcessStep,
+    Service,
+    SiteSettings,
+)
+from website.timing import percentile
+
+CONTACT_FORM = {
+    "full_name": "Benchmark Visitor",
+    "email": "visitor@example.com",
+    "company_name": "Example GmbH",
+    "website": "https://example.com",
+    "country": "Kenya",
+    "service_interest": "scouting",
+    "timeline": "1_3_months",
+    "budget_range": "3k_10k",
+    "contact_method": "email",
+    "subject": "Partner scouting for the DACH region",
+    "message": "We are looking for distributors in Germany and Austria for our coffee exports.",
+    "consent": "on",
+}
+
+# Options copied into the results file
+RECORDED_OPTIONS = (
+    "mode",
+    "requests",
+    "warmup",
+    "inquiries",
+    "concurrency",
+    "workers",
+    "gunicorn_args",
+    "uvicorn_args",
+    "seed",
+)
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def _summary(samples, statuses, elapsed, size):
+    ok = [ms for ms, status in zip(samples, statuses) if status < 400]
+    ordered = sorted(samples)
+    return {
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "statuses": {str(s): statuses.count(s) for s in sorted(set(statuses))},
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0,
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "max_ms": round(max(samples), 3),
+        "bytes": size,
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# =========================
+# Seed data
+# =========================
+def seed(inquiries, rng):
+    SiteSettings.objects.create(
+        site_name="TradeGate Consultants",
+        primary_email="contact@tradegateconsultants.com",
+        phone="+49 30 1234567",
+        address="Friedrichstraße 1\n10117 Berlin",
+        city="Berlin",
+        facebook_url="https://facebook.com/tradegate",
+        instagram_url="https://instagram.com/tradegate",
+        meta_title="TradeGate Consultants",
+        meta_description="EU business representation, trade fairs and market entry.",
+    )
+
+    NavigationItem.objects.bulk_create(
+        [
+            NavigationItem(label="Pillars", kind="anchor", anchor="pillars", order=10),
+            NavigationItem(label="Services", kind="anchor", anchor="services", order=20),
+            NavigationItem(label="Process", kind="anchor", anchor="process", order=30),
+            NavigationItem(label="About", kind="internal", url_name="about", order=40),
+            NavigationItem(label="FAQ", kind="internal", url_name="faq", order=50),
+            NavigationItem(label="Contact", kind="internal", url_name="contact", order=60, is_cta=True),
+        ]
+    )
+
+    Service.objects.bulk_create(
+        Service(
+            title=f"Service {i}",
+            short_description="Representation at trade fairs and partner meetings. " * 3,
+            order=i,
+        )
+        for i in range(8)
+    )
+    Industry.objects.bulk_create(
+        Industry(name=f"Industry {i}", short_description="Agri-food, textiles, machinery and more.", order=i)
+        for i in range(12)
+    )
+    ProcessStep.objects.bulk_create(
+        ProcessStep(title=f"Step {i}", description="Discovery call, plan, execution and follow-up.", order=i)
+        for i in range(5)
+    )
+
+    paragraph = "Angaben gemäß § 5 TMG. Verantwortlich für den Inhalt nach § 55 Abs. 2 RStV. " * 40
+    LegalPage.objects.bulk_create(
+        LegalPage(key=key, title=title, content="\n\n".join([paragraph] * 8))
+        for key, title in LegalPage.KEY_CHOICES
+    )
+
+    services = [value for value, _ in SERVICE_CHOICES]
+    Inquiry.objects.bulk_create(
+        (
+            Inquiry(
+                full_name=f"Visitor {i}",
+                email=f"visitor{i}@example.com",
+                subject=f"Inquiry {i}",
+                message="We would like to exhibit at a trade fair in Germany next spring. " * rng.randint(1, 6),
+                company_name=f"Company {rng.randint(1, inquiries // 3 + 1)}",
+                country=rng.choice(["Kenya", "Rwanda", "India", "UAE", "South Africa", "Nigeria"]),
+                service_interest=rng.choice(services),
+                consent=True,
+                is_handled=rng.random() < 0.7,
+                ip_address=f"10.0.{i // 250 % 256}.{i % 250 + 1}",
+            )
+            for i in range(inquiries)
+        ),
+        batch_size=1000,
+    )
+
+
+def scenarios():
+    """
+    (name, method, path) for every public URL.
+    """
+    items = [
+        ("home", "GET", "/"),
+        ("about", "GET", "/about/"),
+        ("faq", "GET", "/faq/"),
+        ("contact", "GET", "/contact/"),
+        ("contact_post", "POST", "/contact/"),
+    ]
+    items += [(f"legal_{page.key}", "GET", page.get_absolute_url()) for page in LegalPage.objects.all()]
+    items += [("sitemap", "GET", "/sitemap.xml"), ("robots", "GET", "/robots.txt")]
+    return items
+
+
+class Command(BaseCommand):
+    help = "Benchmark every public URL on a seeded throwaway database; write results as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mode",
+            nargs="+",
+            choices=["client", "gunicorn", "uvicorn"],
+            default=["client"],
+            help="One or more of: client, gunicorn, uvicorn.",
+        )
+        parser.add_argument("--requests", type=int, default=300, help="Measured requests per URL.")
+        parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per URL first.")
+        parser.add_argument("--inquiries", type=int, default=5000, help="Inquiry rows to seed.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Client threads (server modes).")
+        parser.add_argument("--workers", type=int, default=2, help="gunicorn / uvicorn workers.")
+        parser.add_argument("--gunicorn-args", default="", help="Extra gunicorn arguments, e.g. '--threads 4'.")
+        parser.add_argument("--uvicorn-args", default="", help="Extra uvicorn arguments, e.g. '--loop uvloop'.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", default="", help="Write results to this JSON file.")
+
+    def handle(self, *args, **options):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and "*" not in h), "localhost").lstrip(".")
+        self.host = host
+
+        old_name, sqlite_file = self._create_database()
+        try:
+            seed(options["inquiries"], random.Random(options["seed"]))
+            # bulk_create sends no signals: drop anything cached from the real database
+            cache.clear_local()
+            for name in (cache.SITE_SETTINGS, cache.NAVIGATION, cache.CONTENT, cache.CHROME, cache.PAGES):
+                cache.bump_version(name)
+
+            results = {
+                "meta": {
+                    "commit": release.git_commit(settings.BASE_DIR),
+                    "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "settings": os.environ.get("DJANGO_SETTINGS_MODULE", ""),
+                    "python": platform.python_version(),
+                    "django": django.get_version(),
+                    "database": connection.vendor,
+                    "host": host,
+                    "options": {k: options[k] for k in RECORDED_OPTIONS},
+                }
+            }
+
+            if "client" in options["mode"]:
+                results["client"] = self._run_client(options)
+            for server in ("gunicorn", "uvicorn"):
+                if server in options["mode"]:
+                    results[server] = self._run_server(server, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if sqlite_file:
+                for suffix in ("", "-wal", "-shm"):
+                    try:
+                        os.unlink(sqlite_file + suffix)
+                    except OSError:
+                        pass
+
+        for mode in ("client", "gunicorn", "uvicorn"):
+            if mode in results:
+                self._print(mode, results[mode])
+        if "gunicorn" in results and "uvicorn" in results:
+            self._compare(results["gunicorn"], results["uvicorn"])
+
+        if options["output"]:
+            directory = os.path.dirname(options["output"])
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+    # -------------------------
+    # Database
+    # -------------------------
+    def _create_database(self):
+        old_name = connection.settings_dict["NAME"]
+        sqlite_file = ""
+        if connection.vendor == "sqlite":
+            # A file rather than :memory:, so gunicorn workers can open it too
+            fd, sqlite_file = tempfile.mkstemp(prefix="tradegate-bench-", suffix=".sqlite3")
+            os.close(fd)
+            connection.settings_dict.setdefault("TEST", {})["NAME"] = sqlite_file
+
+        self.stdout.write("Creating benchmark database...")
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        return old_name, sqlite_file
+
+    # -------------------------
+    # Django test client
+    # -------------------------
+    def _run_client(self, options):
+        self.stdout.write("Benchmarking with the Django test client...")
+        results = {}
+        # Never send real mail from a benchmark
+        with override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend"):
+            client = Client(HTTP_HOST=self.host)
+            for name, method, path in scenarios():
+                results[name] = self._measure(
+                    lambda m=method, p=path: self._client_request(client, m, p),
+                    options["requests"],
+                    options["warmup"],
+                    concurrency=1,
+                )
+        return results
+
+    def _client_request(self, client, method, path):
+        if method == "POST":
+            response = client.post(path, CONTACT_FORM)
+            # Drop the flash message so the next GETs stay anonymous
+            client.cookies.clear()
+        else:
+            response = client.get(path)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, len(body)
+
+    # -------------------------
+    # Local gunicorn / uvicorn
+    # -------------------------
+    def _server_command(self, server, port, options):
+        if server == "uvicorn":
+            return [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "tradegate.asgi:application",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--workers",
+                str(options["workers"]),
+                "--log-level",
+                "warning",
+            ] + options["uvicorn_args"].split()
+
+        return [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "tradegate.wsgi:application",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(options["workers"]),
+            "--log-level",
+            "warning",
+        ] + options["gunicorn_args"].split()
+
+    def _run_server(self, server, options):
+        port = _free_port()
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "tradegate.settings.dev"),
+            "EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend",
+        }
+        if connection.vendor == "sqlite":
+            env["DJANGO_SQLITE_PATH"] = str(connection.settings_dict["NAME"])
+        else:
+            env["DB_NAME"] = connection.settings_dict["NAME"]
+        env["DJANGO_ASYNC_VIEWS"] = "true" if server == "uvicorn" else "false"
+
+        command = self._server_command(server, port, options)
+        self.stdout.write(f"Starting {server}: {' '.join(command[2:])}")
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            self._wait_for(server, base_url, process)
+            self.stdout.write(f"Benchmarking over HTTP with {options['concurrency']} threads...")
+
+            local = threading.local()
+            results = {}
+            for name, method, path in scenarios():
+                results[name] = self._measure(
+                    lambda m=method, p=path: self._http_request(local, base_url, m, p),
+                    options["requests"],
+                    options["warmup"],
+                    concurrency=options["concurrency"],
+                )
+            return results
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def _wait_for(self, server, base_url, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"{server} exited during startup (is it installed?)")
+            try:
+                urllib.request.urlopen(self._request(base_url + "/health/"), timeout=1).read()
+                return
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        raise CommandError(f"{server} did not answer /health/ in time")
+
+    def _request(self, url, data=None, headers=None):
+        # Look like the proxied production request: right Host, https scheme
+        return urllib.request.Request(
+            url,
+            data=data,
+            headers={
+                "Host": self.host,
+                "X-Forwarded-Proto": "https",
+                "Origin": f"https://{self.host}",
+                "Referer": f"https://{self.host}/contact/",
+                **(headers or {}),
+            },
+        )
+
+    def _opener(self, local):
+        if not hasattr(local, "opener"):
+            local.cookies = http.cookiejar.CookieJar()
+            local.opener = urllib.request.build_opener(
+                urllib.request.HTTPCookieProcessor(local.cookies),
+                _NoRedirect,
+            )
+        return local.opener
+
+    def _http_request(self, local, base_url, method, path):
+        opener = self._opener(local)
+        data = None
+        if method == "POST":
+            form = opener.open(self._request(base_url + path)).read().decode("utf-8")
+            token = CSRF_INPUT.search(form)
+            data = urllib.parse.urlencode(
+                {**CONTACT_FORM, "csrfmiddlewaretoken": token.group(1) if token else ""}
+            ).encode()
+        try:
+            response = opener.open(self._request(base_url + path, data=data))
+            status, body = response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            status, body = exc.code, exc.read()
+        if method == "POST":
+            # Forget the session / flash message, keep nothing between requests
+            local.cookies.clear()
+        return status, len(body)
+
+    # -------------------------
+    # Measuring
+    # -------------------------
+    def _measure(self, send, requests, warmup, concurrency):
+        for _ in range(warmup):
+            send()
+
+        def timed(_):
+            start = time.perf_counter()
+            status, size = send()
+            return (time.perf_counter() - start) * 1000, status, size
+
+        start = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                outcomes = list(pool.map(timed, range(requests)))
+        else:
+            outcomes = [timed(i) for i in range(requests)]
+        elapsed = time.perf_counter() - start
+
+        samples = [ms for ms, _, _ in outcomes]
+        statuses = [status for _, status, _ in outcomes]
+        return _summary(samples, statuses, elapsed, outcomes[-1][2])
+
+    def _print(self, mode, results):
+        self.stdout.write("")
+        header = f"{mode:<22}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>8}{'bytes':>9}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<22}{r['rps']:>9.1f}{r['p50_ms']:>8.2f}ms{r['p95_ms']:>8.2f}ms"
+                f"{r['p99_ms']:>8.2f}ms{r['errors']:>8}{r['bytes']:>9}"
+            )
+
+    def _compare(self, sync_results, async_results):
+        self.stdout.write("")
+        header = f"{'sync vs async':<22}{'gunicorn rps':>14}{'uvicorn rps':>14}{'ratio':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, sync in sync_results.items():
+            other = async_results[name]
+            ratio = other["rps"] / sync["rps"] if sync["rps"] else 0
+            self.stdout.write(f"{name:<22}{sync['rps']:>14.1f}{other['rps']:>14.1f}{ratio:>7.2f}x")
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # The contact POST answers 302; measure that response, not the page after it
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
@@ -0,0 +1,142 @@
+"""
+Build the site stylesheet with the Tailwind standalone CLI.
+
+Replaces the runtime CDN compiler: scans website/templates/website/*.html,
+writes a minified, content-hashed file to website/static/website/css/ and
+records it in manifest.json, which the {% built_stylesheet %} tag reads.
+
+Brand colours are CSS custom properties (rgb channels), so
+`bg-brand-accent/10` keeps working. The stylesheet defaults are the fixed
+BRAND_DEFAULTS, not the database, so every machine builds the same file;
+base.html overrides them inline from SiteSettings, so admin edits apply
+without a rebuild.
+
+Get the CLI from https://github.com/tailwindlabs/tailwindcss/releases
+(`tailwindcss-linux-x64`, v3) and point TAILWIND_CLI at it. The production
+deploy (deploy-prod.yml) fetches a pinned CLI and runs this before
+collectstatic.
+"""
+
+import hashlib
+import json
+import shlex
+import subprocess
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from website.templatetags.site_assets import CSS_MANIFEST, rgb_channels
+
+# Fallbacks match the SiteSettings field defaults
+BRAND_DEFAULTS = {
+    "primary": "#0B1220",
+    "accent": "#C6A15B",
+    "muted": "#94A3B8",
+}
+
+CONFIG_TEMPLATE = """module.exports = {
+  content: %(content)s,
+  theme: {
+    extend: {
+      fontFamily: {
+        display: ['Sora', 'sans-serif'],
+        sans: ['DM Sans', 'sans-serif'],
+      },
+      colors: {
+        brand: {
+          primary: 'rgb(var(--brand-primary) / <alpha-value>)',
+          accent: 'rgb(var(--brand-accent) / <alpha-value>)',
+          muted: 'rgb(var(--brand-muted) / <alpha-value>)',
+        },
+      },
+    },
+  },
+};
+"""
+
+INPUT_TEMPLATE = """@tailwind base;
+@tailwind components;
+@tailwind utilities;
+
+@layer base {
+  :root {
+%(variables)s
+  }
+}
+"""
+
+
+class Command(BaseCommand):
+    help = "Build the minified, content-hashed Tailwind stylesheet from the site templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tailwind",
+            default=getattr(settings, "TAILWIND_CLI", "tailwindcss"),
+            help="Tailwind CLI command (default: TAILWIND_CLI setting).",
+        )
+        parser.add_argument(
+            "--keep-old",
+            action="store_true",
+            help="Do not delete previously built site.*.css files.",
+        )
+
+    def handle(self, *args, **options):
+        app_dir = Path(settings.BASE_DIR) / "website"
+        templates = app_dir / "templates" / "website"
+        out_dir = app_dir / "static" / "website" / "css"
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        if not any(templates.glob("*.html")):
+            raise CommandError(f"No templates found in {templates}")
+
+        variables = "\n".join(
+            f"    --brand-{name}: {rgb_channels(default)};" for name, default in BRAND_DEFAULTS.items()
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            config = tmp / "tailwind.config.js"
+            source = tmp / "input.css"
+            output = tmp / "site.css"
+
+            config.write_text(
+                CONFIG_TEMPLATE % {"content": json.dumps([str(templates / "*.html")])},
+                encoding="utf-8",
+            )
+            source.write_text(INPUT_TEMPLATE % {"variables": variables}, encoding="utf-8")
+
+            cmd = shlex.split(options["tailwind"]) + [
+                "-c", str(config),
+                "-i", str(source),
+                "-o", str(output),
+                "--minify",
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+            except FileNotFoundError:
+                raise CommandError(
+                    f"Tailwind CLI not found ({options['tailwind']!r}). Set TAILWIND_CLI or pass --tailwind."
+                )
+            if result.returncode != 0:
+                raise CommandError(f"Tailwind build failed:\n{result.stderr}")
+
+            css = output.read_bytes()
+
+        digest = hashlib.sha256(css).hexdigest()[:12]
+        filename = f"site.{digest}.css"
+        (out_dir / filename).write_bytes(css)
+
+        if not options["keep_old"]:
+            for old in out_dir.glob("site.*.css"):
+                if old.name != filename:
+                    old.unlink()
+
+        manifest = {"site.css": f"website/css/{filename}"}
+        (app_dir / "static" / CSS_MANIFEST).write_text(
+            json.dumps(manifest, indent=2) + "\n", encoding="utf-8"
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Built {filename} ({len(css) / 1024:.1f} KB)"))
@@ -0,0 +1,130 @@
+"""
+Subset Sora / DM Sans to the glyphs the site uses and emit WOFF2 + @font-face CSS.
+
+Replaces the Google Fonts links (two extra origins on the critical path).
+Source fonts come from a local directory; use the variable TTFs from
+https://github.com/google/fonts (ofl/sora, ofl/dmsans).
+
+The glyph set is the fixed ranges below plus the characters in the site
+templates, never database content, so every machine builds the same files.
+The production deploy (deploy-prod.yml) runs this before collectstatic.
+Output goes to website/static/website/fonts/, unhashed on purpose: the
+manifest static storage fingerprints the files and rewrites the url()
+references in fonts.css on collectstatic.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from website.templatetags.site_assets import FONTS_MANIFEST
+
+# (family, style, weight range, output name, preload, source file candidates)
+FONT_FACES = (
+    ("Sora", "normal", "400 700", "sora", True, (
+        "Sora[wght].ttf",
+        "Sora-VariableFont_wght.ttf",
+    )),
+    ("DM Sans", "normal", "400 600", "dm-sans", True, (
+        "DMSans[opsz,wght].ttf",
+        "DMSans-VariableFont_opsz,wght.ttf",
+    )),
+    ("DM Sans", "italic", "400", "dm-sans-italic", False, (
+        "DMSans-Italic[opsz,wght].ttf",
+        "DMSans-Italic-VariableFont_opsz,wght.ttf",
+    )),
+)
+
+# Latin-1 + Latin Extended-A and common punctuation: whatever admins type
+# (names, German legal texts) renders in the site fonts.
+BASE_RANGES = (
+    (0x0020, 0x007E),
+    (0x00A0, 0x017F),
+    (0x2010, 0x2027),
+    (0x2030, 0x203A),
+    (0x20AC, 0x20AC),  # €
+    (0x2190, 0x2193),  # arrows
+)
+
+
+class Command(BaseCommand):
+    help = "Subset the site fonts to the glyphs in use and write WOFF2 files + fonts.css."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            default=getattr(settings, "FONT_SOURCE_DIR", ""),
+            help="Directory with the source TTFs (default: FONT_SOURCE_DIR setting).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from fontTools import subset
+        except ImportError:
+            raise CommandError("fontTools is required: pip install fonttools brotli")
+
+        # fontTools logs every table it touches at INFO
+        logging.getLogger("fontTools").setLevel(logging.WARNING)
+
+        if not options["source"]:
+            raise CommandError("Pass --source or set FONT_SOURCE_DIR.")
+        source = Path(options["source"])
+
+        app_dir = Path(settings.BASE_DIR) / "website"
+        out_dir = app_dir / "static" / "website" / "fonts"
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        templates = sorted((app_dir / "templates" / "website").glob("*.html"))
+        text = "".join(p.read_text(encoding="utf-8") for p in templates)
+
+        unicodes = {ord(c) for c in text if c.isprintable()}
+        for start, end in BASE_RANGES:
+            unicodes.update(range(start, end + 1))
+
+        faces_css = []
+        preload = []
+
+        for family, style, weight, name, should_preload, candidates in FONT_FACES:
+            path = next((source / c for c in candidates if (source / c).exists()), None)
+            if path is None:
+                raise CommandError(
+                    f"{family} ({style}) not found in {source}; expected one of: {', '.join(candidates)}"
+                )
+
+            opts = subset.Options()
+            opts.flavor = "woff2"
+            opts.layout_features = ["*"]
+            opts.name_IDs = ["*"]
+            opts.notdef_outline = True
+
+            font = subset.load_font(str(path), opts)
+            subsetter = subset.Subsetter(opts)
+            subsetter.populate(unicodes=unicodes)
+            subsetter.subset(font)
+
+            filename = f"{name}.woff2"
+            subset.save_font(font, str(out_dir / filename), opts)
+            size = (out_dir / filename).stat().st_size
+
+            faces_css.append(
+                "@font-face{"
+                f'font-family:"{family}";font-style:{style};font-weight:{weight};'
+                f'font-display:swap;src:url("{filename}") format("woff2")'
+                "}"
+            )
+            if should_preload:
+                preload.append(f"website/fonts/{filename}")
+
+            self.stdout.write(f"{filename}: {size / 1024:.1f} KB ({path.name})")
+
+        (out_dir / "fonts.css").write_text("\n".join(faces_css) + "\n", encoding="utf-8")
+
+        manifest = {"stylesheet": "website/fonts/fonts.css", "preload": preload}
+        (app_dir / "static" / FONTS_MANIFEST).write_text(
+            json.dumps(manifest, indent=2) + "\n", encoding="utf-8"
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Subset {len(FONT_FACES)} faces to {len(unicodes)} code points"))
@@ -0,0 +1,104 @@
+"""
+Export inquiries as CSV, JSON Lines or XLSX (website.export).
+
+    python manage.py export_inquiries > inquiries.csv
+    python manage.py export_inquiries --format jsonl --unhandled --since 2026-01-01
+    python manage.py export_inquiries --format xlsx --output leads.xlsx
+
+Incremental (e.g. a nightly cron feeding a CRM): --state keeps the cursor
+of the last exported row, and each run only exports what came after it.
+
+    python manage.py export_inquiries --format jsonl --state /srv/tradegate/export.cursor \\
+        --output /srv/exports/inquiries-$(date +%F).jsonl
+
+The state file is only updated once the output has been written completely.
+The cursor assumes rows become visible in created_at order, which holds for
+the contact form's short insert transactions.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from website import export
+from website.models import Inquiry
+
+
+class Command(BaseCommand):
+    help = "Export inquiries (CSV, JSON Lines or XLSX) in constant memory, optionally incrementally."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=("csv", "jsonl", "xlsx"), default="csv")
+        parser.add_argument("--output", default="", help="File to write (default: stdout; required for xlsx).")
+        parser.add_argument("--since", default="", help="Only inquiries created on/after this ISO date or datetime.")
+        handled = parser.add_mutually_exclusive_group()
+        handled.add_argument("--handled", action="store_true", help="Only handled inquiries.")
+        handled.add_argument("--unhandled", action="store_true", help="Only unhandled inquiries.")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Rows fetched per query (EXPORT_CHUNK_SIZE).")
+        parser.add_argument(
+            "--state",
+            default="",
+            help="Cursor file: continue after the last row of the previous run, and record this run's last row.",
+        )
+
+    def _since(self, value):
+        try:
+            since = datetime.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"--since must be an ISO date or datetime, not {value!r}")
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def handle(self, *args, **options):
+        fmt = options["format"]
+        if fmt == "xlsx":
+            if not options["output"]:
+                raise CommandError("--format xlsx needs --output.")
+            if not export.xlsx_available():
+                raise CommandError("openpyxl is required for XLSX: pip install openpyxl")
+
+        queryset = Inquiry.objects.all()
+        if options["since"]:
+            queryset = queryset.filter(created_at__gte=self._since(options["since"]))
+        if options["handled"]:
+            queryset = queryset.filter(is_handled=True)
+        elif options["unhandled"]:
+            queryset = queryset.filter(is_handled=False)
+
+        state = options["state"]
+        cursor = ""
+        if state and os.path.exists(state):
+            with open(state, encoding="utf-8") as fh:
+                cursor = fh.read().strip()
+        try:
+            queryset = export.export_queryset(queryset, cursor)
+        except ValueError:
+            raise CommandError(f"{state} does not hold an export cursor: {cursor!r}")
+
+        progress = export.Progress()
+        output = options["output"]
+        if fmt == "xlsx":
+            tmp = f"{output}.tmp"
+            with open(tmp, "wb") as fh:
+                export.write_xlsx(queryset, fh, options["chunk_size"], progress)
+            os.replace(tmp, output)
+        elif output:
+            tmp = f"{output}.tmp"
+            with open(tmp, "w", encoding="utf-8", newline="") as fh:
+                fh.writelines(export.LINE_FORMATS[fmt](queryset, options["chunk_size"], progress))
+            os.replace(tmp, output)
+        else:
+            sys.stdout.writelines(export.LINE_FORMATS[fmt](queryset, options["chunk_size"], progress))
+            sys.stdout.flush()
+
+        if state and progress.cursor:
+            with open(f"{state}.tmp", "w", encoding="utf-8") as fh:
+                fh.write(progress.cursor + "\n")
+            os.replace(f"{state}.tmp", state)
+
+        # stderr: stdout may be the export itself
+        self.stderr.write(f"Exported {progress.count} inquiries" + (f" to {output}" if output else ""))
@@ -0,0 +1,130 @@
+"""
+Import-time report for worker boot, from `python -X importtime`.
+
+    python manage.py importtime
+    python manage.py importtime --top 30 --json bench/importtime-$(git rev-parse --short HEAD).json
+
+A fresh interpreter imports tradegate.wsgi (django.setup(), every app,
+admin autodiscovery, the WSGI handler and middleware) and builds the URL
+resolver, which is what a gunicorn worker does before it can answer. The
+report gives the total, the slowest modules by their own import time, and
+the time per package (django, website, whitenoise, ...). The JSON output
+carries the release id and git commit so boot latency can be tracked from
+one release to the next.
+
+Warm-up is switched off in the child (DJANGO_WARMUP=off): this measures
+imports only; `manage.py warmup` times the rest.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from website import release
+
+BOOT = "import tradegate.wsgi; from django.urls import get_resolver; get_resolver().url_patterns"
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """
+    Top-level and nested imports from -X importtime output, in import order.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append(
+                {
+                    "module": name,
+                    "self_ms": int(self_us) / 1000,
+                    "cumulative_ms": int(cumulative_us) / 1000,
+                    "depth": len(indent) // 2,
+                }
+            )
+    return modules
+
+
+def _package(module: str) -> str:
+    parts = module.split(".")
+    # django.contrib.admin rather than just django
+    if parts[:2] == ["django", "contrib"] and len(parts) > 2:
+        return ".".join(parts[:3])
+    return parts[0]
+
+
+class Command(BaseCommand):
+    help = "Report module import times for a worker boot (python -X importtime)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="How many of the slowest modules to list.")
+        parser.add_argument("--runs", type=int, default=3, help="Boots to measure; the fastest one is reported.")
+        parser.add_argument("--json", dest="json_path", default="", help="Also write the report to this file.")
+
+    def _boot(self):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "tradegate.settings.prod"),
+            "DJANGO_WARMUP": "off",
+        }
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        modules = parse_importtime(proc.stderr)
+        if proc.returncode or not modules:
+            tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+            raise CommandError(f"Boot failed (exit {proc.returncode}):\n{tail[-2000:]}")
+        return modules
+
+    def handle(self, *args, **options):
+        # Disk cache and .pyc state differ on the first run; keep the fastest
+        runs = [self._boot() for _ in range(max(1, options["runs"]))]
+        modules = min(runs, key=lambda mods: sum(m["self_ms"] for m in mods))
+
+        total = sum(m["self_ms"] for m in modules)
+        packages = defaultdict(float)
+        for m in modules:
+            packages[_package(m["module"])] += m["self_ms"]
+
+        slowest = sorted(modules, key=lambda m: m["self_ms"], reverse=True)[: options["top"]]
+
+        self.stdout.write(f"{len(modules)} modules imported in {total:.1f}ms (best of {len(runs)})")
+        self.stdout.write("")
+        self.stdout.write(f"{'package':<36}{'ms':>9}{'share':>8}")
+        for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[: options["top"]]:
+            self.stdout.write(f"{name:<36}{ms:>9.1f}{ms / total:>8.1%}")
+        self.stdout.write("")
+        self.stdout.write(f"{'module':<52}{'self ms':>9}{'cumul ms':>10}")
+        for m in slowest:
+            self.stdout.write(f"{m['module']:<52}{m['self_ms']:>9.1f}{m['cumulative_ms']:>10.1f}")
+
+        if options["json_path"]:
+            report = {
+                "release": getattr(settings, "RELEASE_ID", ""),
+                "commit": release.git_commit(settings.BASE_DIR),
+                "python": sys.version.split()[0],
+                "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "total_ms": round(total, 1),
+                "module_count": len(modules),
+                "packages": {name: round(ms, 1) for name, ms in sorted(packages.items())},
+                "slowest": [
+                    {k: (round(v, 2) if isinstance(v, float) else v) for k, v in m.items() if k != "depth"}
+                    for m in slowest
+                ],
+            }
+            with open(options["json_path"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Wrote {options['json_path']}")
@@ -0,0 +1,53 @@
+"""
+Delete inquiries past their retention period (website.retention).
+
+    python manage.py purge_inquiries --dry-run
+    python manage.py purge_inquiries                       # INQUIRY_RETENTION_DAYS
+    python manage.py purge_inquiries --days 180 --archive /srv/tradegate/archive/purged.jsonl.gz
+    python manage.py purge_inquiries --max-seconds 300     # bounded nightly run
+
+Run it daily (cron / systemd timer). Rows go in batches of --batch-size,
+each its own short transaction, with --sleep seconds in between.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from website import retention
+
+
+class Command(BaseCommand):
+    help = "Delete (optionally archive) inquiries older than the retention period, in throttled batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Retention in days (INQUIRY_RETENTION_DAYS).")
+        parser.add_argument(
+            "--batch-size", type=int, default=None, help="Rows per delete (INQUIRY_PURGE_BATCH_SIZE)."
+        )
+        parser.add_argument("--sleep", type=float, default=None, help="Seconds between batches (INQUIRY_PURGE_SLEEP).")
+        parser.add_argument(
+            "--max-seconds", type=float, default=0, help="Stop after this long; the rest goes next run."
+        )
+        parser.add_argument("--archive", default="", help="Append purged rows to this gzipped JSON Lines file first.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted.")
+
+    def handle(self, *args, **options):
+        if options["days"] is not None and options["days"] < 1:
+            raise CommandError("--days must be at least 1.")
+        before = retention.cutoff(options["days"])
+
+        if options["dry_run"]:
+            count = retention.expired(before).count()
+            self.stdout.write(f"{count} inquiries created before {before:%Y-%m-%d %H:%M} would be deleted")
+            return
+
+        counts = retention.purge(
+            before,
+            batch_size=options["batch_size"],
+            sleep=options["sleep"],
+            archive_path=options["archive"],
+            max_seconds=options["max_seconds"],
+        )
+        self.stdout.write(
+            f"Deleted {counts['inquiries']} inquiries and {counts['emails']} emails "
+            f"created before {before:%Y-%m-%d %H:%M} in {counts['batches']} batches"
+        )
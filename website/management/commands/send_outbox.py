@@ -0,0 +1,68 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from website import outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notification emails (OutboundEmail) with retries and backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 50),
+            help="Emails sent per SMTP connection.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 8),
+            help="Attempts before an email is marked dead.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new emails (systemd service). Without it the queue is drained once (cron).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls when the queue is empty (--loop).",
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        if options["loop"]:
+            signal.signal(signal.SIGTERM, self._stop)
+            signal.signal(signal.SIGINT, self._stop)
+
+        while True:
+            close_old_connections()
+            counts = outbox.send_due(
+                batch_size=options["batch_size"],
+                max_attempts=options["max_attempts"],
+            )
+            if any(counts.values()):
+                self.stdout.write(
+                    f"sent={counts['sent']} failed={counts['failed']} dead={counts['dead']}"
+                )
+
+            if self._stopping:
+                break
+
+            # A full batch means there may be more: go again straight away.
+            if sum(counts.values()) >= options["batch_size"]:
+                continue
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def _stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,39 @@
+"""
+Run the worker warm-up (website.warmup) and print how long each step took.
+
+    python manage.py warmup             # urls, templates and site data
+    python manage.py warmup --code-only # what runs before fork (no database)
+
+Useful after a deploy to check that every template still compiles, and to
+see what a worker pays before its first request.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from website import warmup
+
+
+class Command(BaseCommand):
+    help = "Warm URL resolver, templates and site data, printing time per step."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--code-only", action="store_true", help="Skip the steps that query the database.")
+
+    def handle(self, *args, **options):
+        timings = warmup.warm(data=not options["code_only"])
+        for name, ms in timings.items():
+            self.stdout.write(f"{name:<12}{ms:>10.1f}ms")
+        self.stdout.write(f"{'total':<12}{sum(timings.values()):>10.1f}ms")
+        self.stdout.write(f"{len(warmup.template_names())} templates under website/templates/website/")
+
+        # warm() logs failures and carries on, so check the templates explicitly
+        from django.template.loader import get_template
+
+        broken = []
+        for name in warmup.template_names():
+            try:
+                get_template(name)
+            except Exception as exc:
+                broken.append(f"{name}: {exc}")
+        if broken:
+            raise CommandError("Templates failed to compile:\n" + "\n".join(broken))
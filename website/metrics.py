@@ -0,0 +1,443 @@
+"""
+Prometheus-style metrics without a client library: /metrics sums the
+per-process files in METRICS_DIR. See docs/operations.md.
+"""
+
+from __future__ import annotations
+
+import atexit
+import fcntl
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse
+
+from . import timing
+
+logger = logging.getLogger(__name__)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+GAUGE = "gauge"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_CONNECTION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+EMAIL_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# name -> (type, help, buckets)
+METRICS = {
+    "tradegate_http_requests_total": (COUNTER, "HTTP requests by URL name, method and status.", None),
+    "tradegate_http_request_duration_seconds": (HISTOGRAM, "Request latency by URL name.", LATENCY_BUCKETS),
+    "tradegate_db_queries_total": (COUNTER, "SQL queries issued by requests, by URL name.", None),
+    "tradegate_db_connect_seconds": (
+        HISTOGRAM,
+        "Time to open a new database connection, by pool mode.",
+        DB_CONNECTION_BUCKETS,
+    ),
+    "tradegate_db_connections_total": (
+        COUNTER,
+        "Database connections by result (opened/failed/unusable) and pool mode.",
+        None,
+    ),
+    "tradegate_cache_requests_total": (COUNTER, "Cache lookups by cache and result (hit/miss).", None),
+    "tradegate_inquiries_total": (COUNTER, "Contact form inquiries stored.", None),
+    "tradegate_inquiries_purged_total": (COUNTER, "Inquiries deleted by the retention purge.", None),
+    "tradegate_emails_total": (COUNTER, "Outbound emails by result (sent/failed/dead).", None),
+    "tradegate_email_send_duration_seconds": (HISTOGRAM, "Time to hand one email to the SMTP server.", EMAIL_BUCKETS),
+    "tradegate_process_resident_memory_bytes": (GAUGE, "Resident memory of each process.", None),
+}
+
+_lock = threading.Lock()
+
+# (name, labels) -> value; labels is a sorted tuple of (key, value)
+_counters: dict[tuple, float] = {}
+# (name, labels) -> [bucket counts..., +Inf count], sum
+_histograms: dict[tuple, list] = {}
+_gauges: dict[tuple, float] = {}
+
+_last_flush = 0.0
+
+# (pid, token): tells this process's file from one left by an earlier
+# process with the same pid
+_instance: tuple[int, str] | None = None
+_retired = False
+
+EXITED_FILE = "exited.json"
+LOCK_FILE = ".lock"
+
+
+def _key(name: str, labels: dict[str, str]) -> tuple:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# =========================
+# Recording
+# =========================
+def inc(name: str, value: float = 1, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    _maybe_flush()
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    buckets = METRICS[name][2]
+    key = _key(name, labels)
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [[0] * (len(buckets) + 1), 0.0]
+        counts = entry[0]
+        for i, bound in enumerate(buckets):
+            if seconds <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        entry[1] += seconds
+    _maybe_flush()
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe_request(url_name: str, method: str, status: int, seconds: float, queries: int | None) -> None:
+    """
+    Called by TimingMiddleware once per finished request.
+    """
+    inc("tradegate_http_requests_total", url_name=url_name, method=method, status=status)
+    observe("tradegate_http_request_duration_seconds", seconds, url_name=url_name)
+    if queries:
+        inc("tradegate_db_queries_total", queries, url_name=url_name)
+
+
+def _resident_memory() -> int | None:
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # Peak rather than current RSS on platforms without /proc (KiB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return None
+
+
+# =========================
+# Per-process files
+# =========================
+def _metrics_dir() -> Path | None:
+    directory = getattr(settings, "METRICS_DIR", "")
+    return Path(directory) if directory else None
+
+
+def _state() -> dict:
+    rss = _resident_memory()
+    if rss is not None:
+        set_gauge("tradegate_process_resident_memory_bytes", rss)
+
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "instance": _instance_token(),
+            "written": time.time(),
+            "counters": [[name, list(labels), value] for (name, labels), value in _counters.items()],
+            "histograms": [
+                [name, list(labels), list(counts), total] for (name, labels), (counts, total) in _histograms.items()
+            ],
+            "gauges": [[name, list(labels), value] for (name, labels), value in _gauges.items()],
+        }
+
+
+def _instance_token() -> str:
+    global _instance
+    # Forked workers inherit the module: one token per pid
+    if _instance is None or _instance[0] != os.getpid():
+        _instance = (os.getpid(), uuid.uuid4().hex)
+    return _instance[1]
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        # Being replaced right now, or left half-written by a crash
+        logger.warning("Skipping unreadable metrics file %s", path)
+        return None
+
+
+class _DirectoryLock:
+    # Serializes merges into exited.json between processes
+    def __init__(self, directory: Path):
+        self.path = directory / LOCK_FILE
+
+    def __enter__(self):
+        self.fh = open(self.path, "a")
+        fcntl.flock(self.fh, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fh, fcntl.LOCK_UN)
+        self.fh.close()
+
+
+def _merge_exited(directory: Path, state: dict) -> None:
+    """
+    Add a finished process's counters and histograms to exited.json (lock held).
+    """
+    path = directory / EXITED_FILE
+    exited = _read_json(path) or {"pid": None, "counters": [], "histograms": [], "gauges": []}
+
+    counters = {(name, tuple(map(tuple, labels))): value for name, labels, value in exited["counters"]}
+    for name, labels, value in state.get("counters", []):
+        key = (name, tuple(map(tuple, labels)))
+        counters[key] = counters.get(key, 0) + value
+
+    histograms = {
+        (name, tuple(map(tuple, labels))): [counts, total] for name, labels, counts, total in exited["histograms"]
+    }
+    for name, labels, counts, total in state.get("histograms", []):
+        key = (name, tuple(map(tuple, labels)))
+        entry = histograms.get(key)
+        if entry is None:
+            histograms[key] = [list(counts), total]
+        else:
+            entry[0] = [a + b for a, b in zip(entry[0], counts)]
+            entry[1] += total
+
+    exited["counters"] = [[name, list(labels), value] for (name, labels), value in counters.items()]
+    exited["histograms"] = [
+        [name, list(labels), counts, total] for (name, labels), (counts, total) in histograms.items()
+    ]
+    exited["written"] = time.time()
+    _write_json(path, exited)
+
+
+def flush() -> None:
+    """
+    Write this process's metrics to METRICS_DIR (no-op without it).
+    """
+    global _last_flush
+
+    directory = _metrics_dir()
+    if directory is None or _retired:
+        return
+
+    _last_flush = time.monotonic()
+    path = directory / f"{os.getpid()}.json"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        state = _state()
+        previous = _read_json(path)
+        if previous is not None and previous.get("instance") != state["instance"]:
+            # An earlier process had this pid and died without retiring
+            with _DirectoryLock(directory):
+                previous = _read_json(path)
+                if previous is not None and previous.get("instance") != state["instance"]:
+                    _merge_exited(directory, previous)
+                _write_json(path, state)
+        else:
+            _write_json(path, state)
+    except OSError:
+        logger.exception("Could not write metrics to %s", path)
+
+
+def retire() -> None:
+    """
+    At exit: fold this process's metrics into exited.json and remove its file.
+    """
+    global _retired
+
+    directory = _metrics_dir()
+    if directory is None or _retired:
+        return
+    _retired = True
+    path = directory / f"{os.getpid()}.json"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with _DirectoryLock(directory):
+            _merge_exited(directory, _state())
+            path.unlink(missing_ok=True)
+    except OSError:
+        logger.exception("Could not retire metrics to %s", directory)
+
+
+def _maybe_flush() -> None:
+    if time.monotonic() - _last_flush >= getattr(settings, "METRICS_FLUSH_INTERVAL", 5):
+        flush()
+
+
+atexit.register(retire)
+
+
+def _alive(pid: int | None) -> bool:
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _load_states() -> list[dict]:
+    directory = _metrics_dir()
+    if directory is None:
+        return [_state()]
+
+    flush()
+    states = []
+    for path in directory.glob("*.json"):
+        if path.stem.isdigit() and int(path.stem) != os.getpid() and not _alive(int(path.stem)):
+            # Died without retiring (killed): fold it into exited.json
+            try:
+                with _DirectoryLock(directory):
+                    state = _read_json(path)
+                    if state is not None:
+                        _merge_exited(directory, state)
+                        path.unlink(missing_ok=True)
+            except OSError:
+                logger.exception("Could not fold metrics file %s", path)
+            continue
+        state = _read_json(path)
+        if state is not None:
+            states.append(state)
+    # exited.json may have been rewritten by the merges above
+    return [state for state in states if state.get("pid") is not None] + [
+        state for state in [_read_json(directory / EXITED_FILE)] if state is not None
+    ]
+
+
+def collect() -> tuple[dict, dict, dict]:
+    """
+    Counters, histograms and gauges summed over every process.
+    """
+    counters: dict[tuple, float] = {}
+    histograms: dict[tuple, list] = {}
+    gauges: dict[tuple, float] = {}
+
+    for state in _load_states():
+        for name, labels, value in state.get("counters", []):
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+
+        for name, labels, counts, total in state.get("histograms", []):
+            key = (name, tuple(map(tuple, labels)))
+            entry = histograms.get(key)
+            if entry is None:
+                histograms[key] = [list(counts), total]
+            else:
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+
+        pid = state.get("pid")
+        if pid != os.getpid() and not _alive(pid):
+            continue
+        for name, labels, value in state.get("gauges", []):
+            key = (name, tuple(map(tuple, labels)) + (("pid", str(pid)),))
+            gauges[key] = value
+
+    return counters, histograms, gauges
+
+
+# =========================
+# Exposition
+# =========================
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(labels, extra=()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    counters, histograms, gauges = collect()
+    lines = []
+
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+        if kind == HISTOGRAM:
+            for (metric, labels), (counts, total) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(buckets) + ["+Inf"], counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels, [('le', str(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        else:
+            source = counters if kind == COUNTER else gauges
+            for (metric, labels), value in sorted(source.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+PROXY_HEADERS = ("HTTP_X_FORWARDED_FOR", "HTTP_X_REAL_IP", "HTTP_FORWARDED")
+
+
+def _authorized(request) -> bool:
+    token = getattr(settings, "METRICS_TOKEN", "")
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    if token and header.startswith("Bearer ") and hmac.compare_digest(header[7:], token):
+        return True
+    if any(name in request.META for name in PROXY_HEADERS):
+        # Through nginx REMOTE_ADDR is the proxy itself, not the client
+        return False
+    return request.META.get("REMOTE_ADDR") in getattr(settings, "METRICS_ALLOWED_IPS", [])
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the metrics of all processes.
+    """
+    if not _authorized(request):
+        raise Http404
+    response = HttpResponse(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def timing_view(request):
+    """
+    Request phase percentiles of the answering process (website.timing).
+    """
+    if not _authorized(request):
+        raise Http404
+    response = JsonResponse({"pid": os.getpid(), "urls": timing.snapshot()})
+    response["Cache-Control"] = "no-store"
+    return response
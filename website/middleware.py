@@ -0,0 +1,334 @@
+"""
+Per-request instrumentation: phase timing, the query budget, and the
+Server-Timing header (staff only). See docs/operations.md.
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import FileResponse
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from . import metrics, timing
+
+logger = logging.getLogger(__name__)
+
+
+def add_server_timing(response, name: str, duration_ms: float | None = None, desc: str = "") -> None:
+    """
+    Append one metric to the response's Server-Timing header.
+    """
+    entry = name
+    if duration_ms is not None:
+        entry += f";dur={duration_ms:.1f}"
+    if desc:
+        entry += ';desc="{}"'.format(desc.replace('"', "'"))
+
+    existing = response.get("Server-Timing")
+    response["Server-Timing"] = f"{existing}, {entry}" if existing else entry
+
+
+def server_timing_visible(request) -> bool:
+    """
+    Whether this response may carry the Server-Timing breakdown.
+    """
+    visible = getattr(request, "_server_timing_visible", None)
+    if visible is None:
+        visible = getattr(settings, "SERVER_TIMING_PUBLIC", False)
+        # No session cookie: anonymous, and no session lookup needed
+        if not visible and settings.SESSION_COOKIE_NAME in request.COOKIES:
+            user = getattr(request, "user", None)
+            visible = bool(user is not None and user.is_staff)
+        request._server_timing_visible = visible
+    return visible
+
+
+async def aserver_timing_visible(request) -> bool:
+    # request.user can't be loaded lazily from the event loop
+    if getattr(request, "_server_timing_visible", None) is None:
+        if getattr(settings, "SERVER_TIMING_PUBLIC", False):
+            request._server_timing_visible = True
+        elif settings.SESSION_COOKIE_NAME in request.COOKIES and hasattr(request, "auser"):
+            user = await request.auser()
+            request._server_timing_visible = bool(user.is_staff)
+        else:
+            request._server_timing_visible = False
+    return request._server_timing_visible
+
+
+class QueryStats:
+    """
+    Queries seen during one request (installed as a connection execute wrapper).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+class AsyncCapableMiddleware(abc.ABC):
+    """
+    Calls __acall__ instead of handle() when the chain below is async.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.handle(request)
+
+    @abc.abstractmethod
+    def handle(self, request):
+        ...
+
+    @abc.abstractmethod
+    async def __acall__(self, request):
+        ...
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise with an async path (6.6 is sync-only). Static lookups are
+    in-memory when autorefresh is off (production).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class QueryBudgetMiddleware(AsyncCapableMiddleware):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, "QUERY_BUDGET_ENABLED", True)
+        self.max_queries = getattr(settings, "QUERY_BUDGET_MAX_QUERIES", 10)
+        self.max_db_ms = getattr(settings, "QUERY_BUDGET_MAX_DB_MS", 200)
+        self.repeat_threshold = getattr(settings, "QUERY_BUDGET_REPEAT_THRESHOLD", 3)
+        self.server_timing = getattr(settings, "QUERY_BUDGET_SERVER_TIMING", True)
+
+    def handle(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        stats = QueryStats()
+        with self._install(stats):
+            response = self.get_response(request)
+        return self._finish(request, response, stats)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        # Async ORM calls run in the request's sync_to_async thread, which has
+        # its own connections: hook those, not the event loop thread's.
+        stats = QueryStats()
+        stack = await sync_to_async(self._install)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        if self.server_timing:
+            await aserver_timing_visible(request)
+        return self._finish(request, response, stats)
+
+    def _install(self, stats) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def _finish(self, request, response, stats: QueryStats):
+        # Streaming bodies run their queries after we return; what we have is
+        # everything the view did up front.
+        request.query_stats = stats
+
+        if self.server_timing and server_timing_visible(request):
+            add_server_timing(response, "db", stats.duration_ms, f"{stats.count} queries")
+
+        self._report(request, response, stats)
+        return response
+
+    def _report(self, request, response, stats: QueryStats) -> None:
+        if stats.count > self.max_queries or stats.duration_ms > self.max_db_ms:
+            logger.warning(
+                "Query budget exceeded: %s %s -> %s: %s queries, %.1f ms in DB (budget %s queries, %s ms)",
+                request.method,
+                request.path,
+                response.status_code,
+                stats.count,
+                stats.duration_ms,
+                self.max_queries,
+                self.max_db_ms,
+            )
+
+        for sql, n in stats.repeated(self.repeat_threshold):
+            logger.warning(
+                "Possible N+1: %s %s ran the same query %s times: %s",
+                request.method,
+                request.path,
+                n,
+                sql if len(sql) <= 300 else sql[:300] + "...",
+            )
+
+
+class TimingMiddleware(AsyncCapableMiddleware):
+    """
+    Outermost middleware: total time and the Server-Timing phase breakdown.
+
+    Streaming bodies are timed by wrapping streaming_content, except
+    FileResponse: replacing its content would drop file_to_stream, and with
+    it the server's sendfile path. Those are recorded when the headers go out.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, "REQUEST_TIMING_ENABLED", True)
+
+    def handle(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        request.timing = timing.RequestTiming()
+        return self._report(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        request.timing = timing.RequestTiming()
+        response = await self.get_response(request)
+        await aserver_timing_visible(request)
+        return self._report(request, response)
+
+    def _report(self, request, response):
+        total_ms = (time.perf_counter() - request.timing.started) * 1000
+
+        stats = getattr(request, "query_stats", None)
+        phases = timing.breakdown(request.timing, total_ms, stats.duration_ms if stats else None)
+
+        if server_timing_visible(request):
+            for phase, ms in phases.items():
+                # "db" is already in the header (QueryBudgetMiddleware)
+                if phase != "db":
+                    add_server_timing(response, phase, ms)
+
+        if isinstance(response, FileResponse):
+            self._finish(request, response, phases)
+        elif response.streaming and response.is_async:
+            response.streaming_content = self._atimed_stream(request, response, response.streaming_content, phases)
+        elif response.streaming:
+            response.streaming_content = self._timed_stream(request, response, response.streaming_content, phases)
+        else:
+            self._finish(request, response, phases)
+        return response
+
+    def _timed_stream(self, request, response, content, phases):
+        start = time.perf_counter()
+        try:
+            yield from content
+        finally:
+            phases["stream"] = (time.perf_counter() - start) * 1000
+            self._finish(request, response, phases)
+
+    async def _atimed_stream(self, request, response, content, phases):
+        start = time.perf_counter()
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            phases["stream"] = (time.perf_counter() - start) * 1000
+            self._finish(request, response, phases)
+
+    def _finish(self, request, response, phases) -> None:
+        name = timing.url_name(request)
+        timing.record(name, phases)
+        timing.log_line(request, response.status_code, phases)
+
+        stats = getattr(request, "query_stats", None)
+        metrics.observe_request(
+            name,
+            request.method,
+            response.status_code,
+            phases[timing.TOTAL] / 1000,
+            stats.count if stats else None,
+        )
+
+
+class ViewTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Innermost middleware: everything it wraps is URL resolving plus the view.
+    """
+
+    def handle(self, request):
+        request_timing = getattr(request, "timing", None)
+        if request_timing is None:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            request_timing.add("view.total", time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        request_timing = getattr(request, "timing", None)
+        if request_timing is None:
+            return await self.get_response(request)
+
+        start = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            request_timing.add("view.total", time.perf_counter() - start)
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.2 on 2026-10-17 01:01
+
+from django.db import migrations, models
+
+from website.migrations._operations import AddIndexConcurrentlyOnPostgres
+
+
+def keep_single_cta(apps, schema_editor):
+    # Before the constraint: keep the first CTA (navigation order), unset the rest
+    NavigationItem = apps.get_model("website", "NavigationItem")
+    ctas = list(NavigationItem.objects.filter(is_cta=True).order_by("order", "label", "pk").values_list("pk", flat=True))
+    if len(ctas) > 1:
+        NavigationItem.objects.filter(pk__in=ctas[1:]).update(is_cta=False)
+
+
+class Migration(migrations.Migration):
+    # CONCURRENTLY (Postgres) can't run inside a transaction: the contact form
+    # keeps inserting while the website_inquiry indexes build
+    atomic = False
+
+    dependencies = [
+        ('website', '0010_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='industry',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'name'], name='website_industry_active_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='inquiry',
+            index=models.Index(fields=['-created_at'], name='website_inquiry_created_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='inquiry',
+            index=models.Index(fields=['is_handled', '-created_at'], name='website_inquiry_handled_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='navigationitem',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['order', 'label'], name='website_nav_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processstep',
+            index=models.Index(fields=['order'], name='website_step_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'title'], name='website_service_active_idx'),
+        ),
+        migrations.RunPython(keep_single_cta, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='navigationitem',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_cta', True)), fields=('is_cta',), name='website_nav_single_cta', violation_error_message='Only one NavigationItem can be CTA at a time.'),
+        ),
+    ]
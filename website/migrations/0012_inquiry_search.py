@@ -0,0 +1,100 @@
+# Generated by Django 5.0.2 on 2026-10-17 01:02
+
+import website.search
+from django.conf import settings
+from django.db import migrations
+
+# Postgres only; SQLite keeps Django's LIKE search (website/search.py).
+# Field lists are copied here, not imported: this migration has to keep
+# building the same thing whatever website.search looks like later.
+WEIGHTED_FIELDS = (
+    ("full_name", "A"),
+    ("email", "A"),
+    ("subject", "A"),
+    ("company_name", "B"),
+    ("country", "B"),
+    ("message", "C"),
+)
+
+# Substring matches use icontains, i.e. UPPER(col::text) LIKE UPPER(...),
+# so the trigram indexes are on that expression.
+TRIGRAM_FIELDS = ("full_name", "email", "company_name")
+
+INDEXES = [
+    ("website_inquiry_search_idx", "USING gin (search_vector)"),
+] + [
+    (f"website_inquiry_{field}_trgm", f"USING gin (UPPER({field}::text) gin_trgm_ops)")
+    for field in TRIGRAM_FIELDS
+]
+
+VECTOR_SQL = " || ".join(
+    f"setweight(to_tsvector(%(config)s::regconfig, COALESCE({field}::text, '')), '{weight}')"
+    for field, weight in WEIGHTED_FIELDS
+)
+
+# Rows per UPDATE while backfilling: each batch commits on its own
+BATCH_SIZE = 1000
+
+
+def backfill_search_vector(apps, schema_editor):
+    # Existing rows; new and edited ones are updated on save (website.signals)
+    config = getattr(settings, "INQUIRY_SEARCH_CONFIG", "simple")
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM website_inquiry")
+        low, high = cursor.fetchone()
+        if low is None:
+            return
+        for start in range(low, high + 1, BATCH_SIZE):
+            cursor.execute(
+                f"UPDATE website_inquiry SET search_vector = {VECTOR_SQL} "
+                "WHERE id >= %(start)s AND id < %(end)s AND search_vector IS NULL",
+                {"config": config, "start": start, "end": start + BATCH_SIZE},
+            )
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    backfill_search_vector(apps, schema_editor)
+
+    with schema_editor.connection.cursor() as cursor:
+        # An interrupted CONCURRENTLY build leaves an invalid index behind,
+        # which IF NOT EXISTS would then keep
+        cursor.execute(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE NOT i.indisvalid AND c.relname = ANY(%s)",
+            [[name for name, _ in INDEXES]],
+        )
+        invalid = [row[0] for row in cursor.fetchall()]
+    for name in invalid:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    # CONCURRENTLY: the contact form keeps inserting while the indexes build
+    for name, using in INDEXES:
+        schema_editor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON website_inquiry {using}")
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('website', '0011_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inquiry',
+            name='search_vector',
+            field=website.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes, atomic=False),
+    ]
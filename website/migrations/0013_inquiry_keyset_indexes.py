@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-17 01:04
+
+from django.db import migrations, models
+
+from website.migrations._operations import AddIndexConcurrentlyOnPostgres, RemoveIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # CONCURRENTLY (Postgres) can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('website', '0012_inquiry_search'),
+    ]
+
+    # Keyset pages order by (created_at, id): the id tie-breaker belongs in the index
+    operations = [
+        RemoveIndexConcurrentlyOnPostgres(
+            model_name='inquiry',
+            name='website_inquiry_created_idx',
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='inquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='website_inquiry_created_idx'),
+        ),
+        RemoveIndexConcurrentlyOnPostgres(
+            model_name='inquiry',
+            name='website_inquiry_handled_idx',
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='inquiry',
+            index=models.Index(fields=['is_handled', '-created_at', '-id'], name='website_inquiry_handled_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+"""
+Migration operations shared by several migrations (not a migration itself).
+"""
+
+from django.db import migrations
+
+
+class AddIndexConcurrentlyOnPostgres(migrations.AddIndex):
+    """
+    AddIndexConcurrently on Postgres, a plain AddIndex elsewhere.
+
+    django.contrib.postgres needs a Postgres driver at import, so it is only
+    imported on Postgres. The migration must set atomic = False.
+    """
+
+    def _concurrently(self):
+        from django.contrib.postgres.operations import AddIndexConcurrently
+
+        return AddIndexConcurrently(self.model_name, self.index)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self._concurrently().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        self._concurrently().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class RemoveIndexConcurrentlyOnPostgres(migrations.RemoveIndex):
+    """
+    RemoveIndexConcurrently on Postgres, a plain RemoveIndex elsewhere.
+    """
+
+    def _concurrently(self):
+        from django.contrib.postgres.operations import RemoveIndexConcurrently
+
+        return RemoveIndexConcurrently(self.model_name, self.name)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self._concurrently().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        self._concurrently().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models import Q
 from django.core.validators import MinLengthValidator, URLValidator
 from django.core.exceptions import ValidationError
 from django.urls import reverse
+from django.utils import timezone
+
+from .search import SearchVectorField
 
 
 class TimeStampedModel(models.Model):
@@ -116,6 +120,19 @@ class NavigationItem(TimeStampedModel):
         ordering = ("order", "label")
         verbose_name = "Navigation Item"
         verbose_name_plural = "Navigation"
+        indexes = [
+            # Navigation: is_visible ORDER BY order, label
+            models.Index(fields=["order", "label"], condition=Q(is_visible=True), name="website_nav_visible_idx"),
+        ]
+        constraints = [
+            # Only one CTA item at a time
+            models.UniqueConstraint(
+                fields=["is_cta"],
+                condition=Q(is_cta=True),
+                name="website_nav_single_cta",
+                violation_error_message="Only one NavigationItem can be CTA at a time.",
+            ),
+        ]
 
     def __str__(self):
         return self.label
@@ -136,13 +153,7 @@ class NavigationItem(TimeStampedModel):
         if self.kind == "external" and not self.external_url:
             raise ValidationError({"external_url": "external_url is required when kind = external."})
 
-        # Only one CTA item at a time
-        if self.is_cta:
-            qs = NavigationItem.objects.filter(is_cta=True)
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            if qs.exists():
-                raise ValidationError({"is_cta": "Only one NavigationItem can be CTA at a time."})
+        # Single CTA: Meta.constraints (checked by full_clean, enforced by the DB)
 
     def get_href(self):
         if self.kind == "anchor" and self.anchor:
@@ -169,6 +180,10 @@ class Service(TimeStampedModel):
 
     class Meta:
         ordering = ["order", "title"]
+        indexes = [
+            # Home page: is_active ORDER BY order, title
+            models.Index(fields=["order", "title"], condition=Q(is_active=True), name="website_service_active_idx"),
+        ]
 
 
 class Industry(TimeStampedModel):
@@ -183,6 +198,10 @@ class Industry(TimeStampedModel):
     class Meta:
         ordering = ["order", "name"]
         verbose_name_plural = "Industries"
+        indexes = [
+            # Home page: is_active ORDER BY order, name
+            models.Index(fields=["order", "name"], condition=Q(is_active=True), name="website_industry_active_idx"),
+        ]
 
 
 class ProcessStep(TimeStampedModel):
@@ -195,6 +214,9 @@ class ProcessStep(TimeStampedModel):
 
     class Meta:
         ordering = ["order"]
+        indexes = [
+            models.Index(fields=["order"], name="website_step_order_idx"),
+        ]
 
 
 class LegalPage(TimeStampedModel):
@@ -246,12 +268,68 @@ class Inquiry(TimeStampedModel):
 
     is_handled = models.BooleanField(default=False)
 
+    # Postgres full-text search for the admin (website.search); NULL on SQLite
+    search_vector = SearchVectorField(null=True, editable=False)
+
     def __str__(self):
         return f"{self.full_name} — {self.subject}"
 
     class Meta:
         ordering = ["-created_at"]
         verbose_name_plural = "Inquiries"
+        indexes = [
+            # Admin changelist: newest first (ties by id, also the keyset cursor),
+            # and the is_handled filter on top of it
+            models.Index(fields=["-created_at", "-id"], name="website_inquiry_created_idx"),
+            models.Index(fields=["is_handled", "-created_at", "-id"], name="website_inquiry_handled_idx"),
+        ]
+
+
+class OutboundEmail(TimeStampedModel):
+    """
+    Durable outbox for notification emails.
 
+    The contact view only inserts a row (in the same transaction as the
+    Inquiry); `manage.py send_outbox` delivers it with retries/backoff.
+    """
 
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_DEAD, "Dead (gave up)"),
+    )
 
+    inquiry = models.ForeignKey(
+        Inquiry,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="emails",
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.TextField(help_text="Comma-separated recipients.")
+    reply_to = models.TextField(blank=True, default="", help_text="Comma-separated addresses.")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} → {self.to}"
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+        indexes = [
+            # send_outbox: status = pending AND next_attempt_at <= now
+            models.Index(fields=["status", "next_attempt_at"], name="website_outbox_due_idx"),
+        ]
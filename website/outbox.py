@@ -0,0 +1,176 @@
+"""
+Outbound email queue (see OutboundEmail).
+
+enqueue() is cheap and runs inside the request. send_due() runs in the
+`send_outbox` management command: it claims a batch of due rows, sends them
+over one SMTP connection, and reschedules failures with exponential backoff
+until EMAIL_OUTBOX_MAX_ATTEMPTS, after which the row is marked dead.
+
+Claiming is a lease: one short transaction moves the batch's next_attempt_at
+EMAIL_OUTBOX_LEASE seconds ahead, so no other worker picks those rows up,
+and no lock is held while SMTP talks. Each row's result is then saved on its
+own. If the worker dies mid-batch, its unsent rows come due again once the
+lease runs out.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import metrics
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def _split(addresses: str) -> list[str]:
+    return [a.strip() for a in addresses.split(",") if a.strip()]
+
+
+def enqueue(message: EmailMessage, inquiry=None) -> OutboundEmail:
+    """
+    Store `message` for delivery by the outbox worker.
+    """
+    return OutboundEmail.objects.create(
+        inquiry=inquiry,
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        to=", ".join(message.to),
+        reply_to=", ".join(message.reply_to),
+    )
+
+
+def to_message(email: OutboundEmail, connection=None) -> EmailMessage:
+    return EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=_split(email.to),
+        reply_to=_split(email.reply_to),
+        connection=connection,
+    )
+
+
+def backoff(attempts: int) -> timedelta:
+    """
+    Delay before retry number `attempts` (1-based): base * 2^(n-1), capped, with jitter.
+    """
+    base = getattr(settings, "EMAIL_OUTBOX_BACKOFF_BASE", 30)
+    cap = getattr(settings, "EMAIL_OUTBOX_BACKOFF_MAX", 3600)
+    delay = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _record_failure(email: OutboundEmail, exc: Exception, max_attempts: int) -> None:
+    email.attempts += 1
+    email.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+
+    if email.attempts >= max_attempts:
+        email.status = OutboundEmail.STATUS_DEAD
+        logger.error(
+            "Outbound email id=%s dead after %s attempts: %s",
+            email.pk,
+            email.attempts,
+            email.last_error,
+        )
+    else:
+        email.next_attempt_at = timezone.now() + backoff(email.attempts)
+        logger.warning(
+            "Outbound email id=%s failed (attempt %s), retry at %s: %s",
+            email.pk,
+            email.attempts,
+            email.next_attempt_at.isoformat(),
+            email.last_error,
+        )
+
+
+def claim(batch_size: int) -> list[OutboundEmail]:
+    """
+    Lease up to batch_size due emails to this worker (one short transaction).
+    """
+    lease = timedelta(seconds=getattr(settings, "EMAIL_OUTBOX_LEASE", 600))
+    with transaction.atomic():
+        now = timezone.now()
+        # skip_locked lets several workers drain the same table (Postgres).
+        due = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "pk")[:batch_size]
+        )
+        if due:
+            OutboundEmail.objects.filter(pk__in=[email.pk for email in due]).update(
+                next_attempt_at=now + lease, updated_at=now
+            )
+    return due
+
+
+def send_due(batch_size: int = 50, max_attempts: int | None = None) -> dict[str, int]:
+    """
+    Send one batch of due emails. Returns counts: {"sent", "failed", "dead"}.
+    """
+    if max_attempts is None:
+        max_attempts = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 8)
+
+    counts = {"sent": 0, "failed": 0, "dead": 0}
+
+    due = claim(batch_size)
+    if not due:
+        return counts
+
+    connection = get_connection(fail_silently=False)
+    is_open = False
+    try:
+        for email in due:
+            start = time.perf_counter()
+            try:
+                if not is_open:
+                    connection.open()
+                    is_open = True
+                connection.send_messages([to_message(email, connection)])
+                metrics.observe("tradegate_email_send_duration_seconds", time.perf_counter() - start)
+            except Exception as exc:
+                # The connection may be unusable now; reopen for the next row.
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+                is_open = False
+
+                _record_failure(email, exc, max_attempts)
+                result = "dead" if email.status == OutboundEmail.STATUS_DEAD else "failed"
+                counts[result] += 1
+                metrics.inc("tradegate_emails_total", result=result)
+            else:
+                email.status = OutboundEmail.STATUS_SENT
+                email.attempts += 1
+                email.sent_at = timezone.now()
+                email.last_error = ""
+                counts["sent"] += 1
+                metrics.inc("tradegate_emails_total", result="sent")
+                logger.info("Outbound email id=%s sent to=%s", email.pk, email.to)
+
+            with transaction.atomic():
+                email.save(
+                    update_fields=[
+                        "status",
+                        "attempts",
+                        "next_attempt_at",
+                        "last_error",
+                        "sent_at",
+                        "updated_at",
+                    ]
+                )
+    finally:
+        if is_open:
+            connection.close()
+
+    return counts
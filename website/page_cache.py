@@ -0,0 +1,159 @@
+"""
+Full-page cache for anonymous GETs of the public pages (PAGE_CACHE_ENABLED).
+See docs/operations.md for what is cached and when.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import cache as site_cache
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+PAGE_KEY = "website:page:{version}:{digest}"
+
+# Headers that describe the content itself; everything else is per-response.
+STORED_HEADERS = ("Content-Type", "Content-Language", "Vary")
+
+
+def _enabled() -> bool:
+    return getattr(settings, "PAGE_CACHE_ENABLED", False)
+
+
+def _timeout() -> int:
+    return getattr(settings, "PAGE_CACHE_TIMEOUT", 600)
+
+
+def purge() -> None:
+    """
+    Drop every cached page (called when page content changes).
+    """
+    site_cache.bump_version(site_cache.PAGES)
+
+
+def _page_key(request) -> str:
+    raw = f"{request.scheme}://{request.get_host()}{request.path}"
+    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    return PAGE_KEY.format(version=site_cache.cache_version(site_cache.PAGES), digest=digest)
+
+
+def _has_pending_messages(request) -> bool:
+    if CookieStorage.cookie_name in request.COOKIES:
+        return True
+    storage = getattr(request, "_messages", None)
+    return bool(getattr(storage, "_queued_messages", None))
+
+
+def _is_cacheable_request(request) -> bool:
+    return (
+        _enabled()
+        and request.method in ("GET", "HEAD")
+        and not request.META.get("QUERY_STRING")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and not _has_pending_messages(request)
+    )
+
+
+def _is_cacheable_response(request, response) -> bool:
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    # Cookies the middleware is about to set on the way out
+    if request.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+        return False
+    session = getattr(request, "session", None)
+    if session is not None and session.modified:
+        return False
+    return not _has_pending_messages(request)
+
+
+def _to_entry(response) -> tuple[int, bytes, dict[str, str]]:
+    headers = {name: response[name] for name in STORED_HEADERS if response.has_header(name)}
+    return response.status_code, response.content, headers
+
+
+def _from_entry(entry) -> HttpResponse:
+    status, content, headers = entry
+    response = HttpResponse(content, status=status)
+    for name, value in headers.items():
+        response[name] = value
+    response["X-Page-Cache"] = "hit"
+    return response
+
+
+def cache_public_page(view):
+    """
+    Serve anonymous GETs of `view` from the page cache when enabled.
+    """
+    if iscoroutinefunction(view):
+        return _acache_public_page(view)
+
+    @wraps(view)
+    def _wrapped(request, *args, **kwargs):
+        if not _is_cacheable_request(request):
+            return view(request, *args, **kwargs)
+
+        try:
+            key = _page_key(request)
+            entry = cache.get(key)
+        except Exception:
+            logger.exception("Page cache lookup failed for %s", request.path)
+            return view(request, *args, **kwargs)
+
+        if entry is not None:
+            metrics.inc("tradegate_cache_requests_total", cache="page", result="hit")
+            return _from_entry(entry)
+
+        metrics.inc("tradegate_cache_requests_total", cache="page", result="miss")
+
+        response = view(request, *args, **kwargs)
+
+        if _is_cacheable_response(request, response):
+            try:
+                cache.set(key, _to_entry(response), _timeout())
+            except Exception:
+                logger.exception("Page cache store failed for %s", request.path)
+            response["X-Page-Cache"] = "miss"
+        return response
+
+    return _wrapped
+
+
+def _acache_public_page(view):
+    @wraps(view)
+    async def _wrapped(request, *args, **kwargs):
+        if not _is_cacheable_request(request):
+            return await view(request, *args, **kwargs)
+
+        try:
+            key = await sync_to_async(_page_key)(request)
+            entry = await cache.aget(key)
+        except Exception:
+            logger.exception("Page cache lookup failed for %s", request.path)
+            return await view(request, *args, **kwargs)
+
+        if entry is not None:
+            metrics.inc("tradegate_cache_requests_total", cache="page", result="hit")
+            return _from_entry(entry)
+
+        metrics.inc("tradegate_cache_requests_total", cache="page", result="miss")
+        response = await view(request, *args, **kwargs)
+
+        if _is_cacheable_response(request, response):
+            try:
+                await cache.aset(key, _to_entry(response), _timeout())
+            except Exception:
+                logger.exception("Page cache store failed for %s", request.path)
+            response["X-Page-Cache"] = "miss"
+        return response
+
+    return _wrapped
@@ -0,0 +1,44 @@
+"""
+Which release is running.
+
+The deploy workflow writes the checked-out commit to RELEASE_FILE in the app
+directory, and settings read it once at import (RELEASE_ID). No Django
+imports here: tradegate.settings uses this module.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+RELEASE_FILE = "RELEASE"
+
+
+def git_commit(root: Path) -> str:
+    """
+    Commit checked out in root, read from .git (no git binary needed).
+    """
+    git = Path(root) / ".git"
+    try:
+        head = (git / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head
+        ref = head[5:]
+        if (git / ref).exists():
+            return (git / ref).read_text().strip()
+        for line in (git / "packed-refs").read_text().splitlines():
+            if line.endswith(" " + ref):
+                return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    return ""
+
+
+def release_id(root: Path) -> str:
+    """
+    The id the deploy wrote to root/RELEASE_FILE, else the checked-out commit.
+    """
+    try:
+        written = (Path(root) / RELEASE_FILE).read_text().strip()
+    except OSError:
+        written = ""
+    return written or git_commit(root)
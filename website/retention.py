@@ -0,0 +1,175 @@
+"""
+Retention for contact form data (GDPR): inquiries older than
+INQUIRY_RETENTION_DAYS are deleted, together with the notification emails
+that copied their message (OutboundEmail).
+
+A single DELETE of years of rows would hold its locks for the whole run and
+leave one huge burst of dead tuples; purge() instead deletes in batches of
+INQUIRY_PURGE_BATCH_SIZE rows, oldest first, one short transaction each,
+sleeping INQUIRY_PURGE_SLEEP seconds in between so autovacuum and normal
+traffic keep up. Before a batch is deleted it can be appended to a gzipped
+JSON Lines archive (website.export format).
+
+The archive is a file and the delete a transaction, so they can't commit
+together. Each batch is one gzip member, and a marker file next to the
+archive records where the batch starts and which rows it holds. If the
+delete did not commit (crash, killed run), the next purge truncates the
+archive back to that offset before archiving the rows again, so every row
+is in the archive exactly once.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import export, metrics
+from .models import Inquiry, OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def cutoff(days: int | None = None) -> datetime:
+    if days is None:
+        days = getattr(settings, "INQUIRY_RETENTION_DAYS", 365)
+    return timezone.now() - timedelta(days=days)
+
+
+def expired(before: datetime):
+    return Inquiry.objects.filter(created_at__lt=before)
+
+
+# =========================
+# Batched purge
+# =========================
+def _archive(fh, ids) -> None:
+    queryset = export.export_queryset(Inquiry.objects.filter(pk__in=ids))
+    for line in export.jsonl_lines(queryset):
+        fh.write(line.encode("utf-8"))
+
+
+def _marker(archive_path: str) -> str:
+    return f"{archive_path}.pending"
+
+
+def recover_archive(archive_path: str) -> bool:
+    """
+    Take back out the last archived batch if its delete never committed.
+    """
+    try:
+        with open(_marker(archive_path)) as fh:
+            pending = json.load(fh)
+    except FileNotFoundError:
+        return False
+
+    # The batch is deleted in one transaction: all of its rows or none are gone
+    recovered = Inquiry.objects.filter(pk__in=pending["ids"]).exists()
+    if recovered:
+        with open(archive_path, "r+b") as fh:
+            fh.truncate(pending["offset"])
+        logger.warning("Archived batch of %s inquiries was not deleted; archiving it again", len(pending["ids"]))
+    os.unlink(_marker(archive_path))
+    return recovered
+
+
+def _archive_batch(archive_path: str, ids) -> None:
+    with open(archive_path, "ab") as raw:
+        marker = _marker(archive_path)
+        with open(f"{marker}.tmp", "w") as fh:
+            json.dump({"offset": raw.tell(), "ids": ids}, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(f"{marker}.tmp", marker)
+
+        with gzip.GzipFile(fileobj=raw, mode="wb") as fh:
+            _archive(fh, ids)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def purge(
+    before: datetime,
+    batch_size: int | None = None,
+    sleep: float | None = None,
+    archive_path: str = "",
+    max_seconds: float = 0,
+) -> dict[str, int]:
+    """
+    Delete inquiries created before `before`, in batches; returns counts.
+    """
+    batch_size = batch_size or getattr(settings, "INQUIRY_PURGE_BATCH_SIZE", 500)
+    sleep = getattr(settings, "INQUIRY_PURGE_SLEEP", 0.2) if sleep is None else sleep
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    counts = {"inquiries": 0, "emails": 0, "batches": 0}
+
+    if archive_path:
+        recover_archive(archive_path)
+    while True:
+        ids = list(expired(before).order_by("created_at", "id").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            break
+        if archive_path:
+            _archive_batch(archive_path, ids)
+
+        with transaction.atomic():
+            # The notification email carries the same personal data
+            emails, _ = OutboundEmail.objects.filter(inquiry_id__in=ids).delete()
+            inquiries, _ = Inquiry.objects.filter(pk__in=ids).delete()
+
+        counts["emails"] += emails
+        counts["inquiries"] += inquiries
+        counts["batches"] += 1
+        metrics.inc("tradegate_inquiries_purged_total", inquiries)
+
+        if len(ids) < batch_size:
+            break
+        if deadline and time.monotonic() >= deadline:
+            logger.info("Purge stopped at its time limit; the rest goes next run")
+            break
+        if sleep:
+            time.sleep(sleep)
+    if archive_path:
+        # Every archived batch is deleted: nothing to take back next run
+        recover_archive(archive_path)
+
+    # Emails whose inquiry is already gone (SET_NULL), once delivered or given up
+    counts["emails"] += purge_emails(before, batch_size, sleep, deadline)
+    logger.info(
+        "Purged %s inquiries and %s emails created before %s",
+        counts["inquiries"],
+        counts["emails"],
+        before.isoformat(),
+    )
+    return counts
+
+
+def purge_emails(before: datetime, batch_size: int, sleep: float = 0, deadline: float | None = None) -> int:
+    """
+    Delete sent/dead emails created before `before`, in batches, like purge().
+    """
+    queryset = (
+        OutboundEmail.objects.filter(created_at__lt=before)
+        .exclude(status=OutboundEmail.STATUS_PENDING)
+        .order_by("created_at", "pk")
+    )
+    deleted = 0
+    while True:
+        if deadline and time.monotonic() >= deadline:
+            logger.info("Email purge stopped at its time limit; the rest goes next run")
+            return deleted
+        ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += OutboundEmail.objects.filter(pk__in=ids).delete()[0]
+        if len(ids) < batch_size:
+            return deleted
+        if sleep:
+            time.sleep(sleep)
@@ -0,0 +1,99 @@
+"""
+Inquiry search for the admin changelist.
+
+On Postgres every Inquiry carries a weighted tsvector (search_vector), kept
+up to date on save (website.signals) and indexed with GIN, and the short
+identity fields have trigram indexes so partial matches ("mueller",
+"@acme.") don't scan the table either:
+
+    A  full_name, email, subject
+    B  company_name, country
+    C  message
+
+A search matches the tsvector (websearch syntax: "quoted phrase", -exclude,
+or) or a substring of full_name / email / company_name, and the results are
+ranked: text rank plus trigram similarity of the name and email.
+
+On SQLite (development) the admin falls back to Django's search_fields
+(LIKE on every field).
+
+INQUIRY_SEARCH_CONFIG picks the text search configuration ("simple" keeps
+every word as typed; "german" / "english" stem).
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import connection, models
+from django.db.models import F, Q
+
+# Fields copied into the vector, with their weight
+WEIGHTED_FIELDS = (
+    ("full_name", "A"),
+    ("email", "A"),
+    ("subject", "A"),
+    ("company_name", "B"),
+    ("country", "B"),
+    ("message", "C"),
+)
+
+# Trigram-indexed for substring matches (see migration 0012)
+TRIGRAM_FIELDS = ("full_name", "email", "company_name")
+
+
+class SearchVectorField(models.Field):
+    """
+    A tsvector column.
+
+    django.contrib.postgres.search has the same field but needs psycopg at
+    import; this one lets the model load on SQLite, where the column just
+    stays NULL.
+    """
+
+    description = "PostgreSQL tsvector"
+
+    def db_type(self, connection):
+        return "tsvector"
+
+
+def enabled() -> bool:
+    return connection.vendor == "postgresql" and getattr(settings, "INQUIRY_FULLTEXT_SEARCH", True)
+
+
+def _config() -> str:
+    return getattr(settings, "INQUIRY_SEARCH_CONFIG", "simple")
+
+
+def search_vector():
+    """
+    The weighted vector expression for one Inquiry row (Postgres only).
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field, weight in WEIGHTED_FIELDS:
+        part = SearchVector(field, weight=weight, config=_config())
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(queryset) -> int:
+    return queryset.update(search_vector=search_vector())
+
+
+def search(queryset, term: str):
+    """
+    Filter queryset by term and annotate search_rank (higher is better).
+    """
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorExact, TrigramWordSimilarity
+
+    query = SearchQuery(term, search_type="websearch", config=_config())
+    matches = Q(SearchVectorExact(F("search_vector"), query))
+    for field in TRIGRAM_FIELDS:
+        matches |= Q(**{f"{field}__icontains": term})
+
+    rank = SearchRank(F("search_vector"), query)
+    for field in ("full_name", "email"):
+        rank += TrigramWordSimilarity(term, field)
+
+    return queryset.filter(matches).annotate(search_rank=rank)
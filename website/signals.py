@@ -0,0 +1,76 @@
+"""
+Cache invalidation hooks.
+
+- SiteSettings / NavigationItem: process memos and the header/footer
+  fragment version (website.cache)
+- Any model rendered into public pages: content stamps (website.conditional)
+  and the page cache (website.page_cache)
+
+Also keeps Inquiry.search_vector current on Postgres (website.search).
+
+Admin saves run inside a transaction, so versions are bumped on commit:
+bumping earlier would let a concurrent request re-cache the old row.
+"""
+
+from functools import partial
+
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache, page_cache, search
+from .models import (
+    Inquiry,
+    SiteSettings,
+    NavigationItem,
+    Service,
+    Industry,
+    ProcessStep,
+    LegalPage,
+)
+
+# Models whose rows end up in the cached public pages
+PAGE_CONTENT_MODELS = (SiteSettings, NavigationItem, Service, Industry, ProcessStep, LegalPage)
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+def site_settings_changed(sender, **kwargs):
+    transaction.on_commit(partial(cache.bump_version, cache.SITE_SETTINGS))
+    transaction.on_commit(partial(cache.bump_version, cache.CHROME))
+
+
+@receiver(post_save, sender=NavigationItem)
+@receiver(post_delete, sender=NavigationItem)
+def navigation_changed(sender, **kwargs):
+    transaction.on_commit(partial(cache.bump_version, cache.NAVIGATION))
+    transaction.on_commit(partial(cache.bump_version, cache.CHROME))
+
+
+@receiver(setting_changed)
+def urlconf_changed(sender, setting, **kwargs):
+    # Cached hrefs were reversed against the previous URLconf.
+    if setting == "ROOT_URLCONF":
+        cache.bump_version(cache.NAVIGATION)
+        cache.bump_version(cache.CHROME)
+
+
+def page_content_changed(sender, **kwargs):
+    transaction.on_commit(partial(cache.bump_version, cache.CONTENT))
+    transaction.on_commit(page_cache.purge)
+
+
+for _model in PAGE_CONTENT_MODELS:
+    post_save.connect(page_content_changed, sender=_model, dispatch_uid=f"page_cache:save:{_model.__name__}")
+    post_delete.connect(page_content_changed, sender=_model, dispatch_uid=f"page_cache:delete:{_model.__name__}")
+
+
+@receiver(post_save, sender=Inquiry)
+def inquiry_saved(sender, instance, update_fields=None, **kwargs):
+    if not search.enabled():
+        return
+    # e.g. list_editable is_handled: no searchable text changed
+    if update_fields and not set(update_fields) & {field for field, _ in search.WEIGHTED_FIELDS}:
+        return
+    search.update_search_vector(Inquiry.objects.filter(pk=instance.pk))
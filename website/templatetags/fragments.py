@@ -0,0 +1,45 @@
+"""
+{% prerendered "name" %}...{% endprerendered %}
+
+Static fragment mode (TEMPLATE_STATIC_FRAGMENTS): the enclosed block is
+rendered once per worker and content version (any save of a page content
+model bumps it, see website.signals) and then reused as a string.
+
+Only wrap markup that is the same for every visitor and every request:
+no csrf_token, messages, request.*, forms or per-view context.
+"""
+
+from django import template
+from django.conf import settings
+
+from website import cache
+
+register = template.Library()
+
+
+class PrerenderedNode(template.Node):
+    def __init__(self, nodelist, name):
+        self.nodelist = nodelist
+        self.name = name
+
+    def render(self, context):
+        if not getattr(settings, "TEMPLATE_STATIC_FRAGMENTS", False):
+            return self.nodelist.render(context)
+
+        name = self.name.resolve(context)
+        return cache.memoize(
+            f"fragment:{name}",
+            lambda: self.nodelist.render(context),
+            version_of=cache.CONTENT,
+        )
+
+
+@register.tag
+def prerendered(parser, token):
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes exactly one argument (the fragment name).")
+
+    nodelist = parser.parse(("endprerendered",))
+    parser.delete_first_token()
+    return PrerenderedNode(nodelist, parser.compile_filter(bits[1]))
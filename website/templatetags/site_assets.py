@@ -0,0 +1,79 @@
+"""
+Template helpers for built front-end assets.
+
+- `manage.py build_css`   -> website/css/manifest.json   ({% built_stylesheet %})
+- `manage.py build_fonts` -> website/fonts/manifest.json ({% self_hosted_fonts %})
+
+Until an asset is built the tags return nothing and base.html falls back to
+the CDN versions.
+"""
+
+import json
+import re
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+
+register = template.Library()
+
+CSS_MANIFEST = "website/css/manifest.json"
+FONTS_MANIFEST = "website/fonts/manifest.json"
+
+_HEX_RE = re.compile(r"^#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6})$")
+
+
+def rgb_channels(value, default="0 0 0"):
+    """
+    "#C6A15B" -> "198 161 91" (space-separated, for rgb(var(--x) / <alpha>)).
+    """
+    match = _HEX_RE.match((value or "").strip())
+    if not match:
+        return default
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    return " ".join(str(int(digits[i:i + 2], 16)) for i in (0, 2, 4))
+
+
+register.filter("rgb_channels", rgb_channels)
+
+
+@lru_cache(maxsize=None)
+def _read_manifest(name: str) -> dict:
+    path = settings.BASE_DIR / "website" / "static" / name
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _manifest(name: str) -> dict:
+    if settings.DEBUG:
+        # Pick up rebuilds without restarting runserver
+        _read_manifest.cache_clear()
+    return _read_manifest(name)
+
+
+@register.simple_tag
+def built_stylesheet(name="site.css"):
+    """
+    Static URL of the built, content-hashed stylesheet, or "" if not built yet.
+    """
+    path = _manifest(CSS_MANIFEST).get(name)
+    return static(path) if path else ""
+
+
+@register.simple_tag
+def self_hosted_fonts():
+    """
+    {"stylesheet": url, "preload": [urls]} for the subsetted WOFF2 fonts, or None.
+    """
+    manifest = _manifest(FONTS_MANIFEST)
+    if not manifest.get("stylesheet"):
+        return None
+    return {
+        "stylesheet": static(manifest["stylesheet"]),
+        "preload": [static(path) for path in manifest.get("preload", [])],
+    }
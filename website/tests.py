@@ -1,3 +1,812 @@
-from django.test import TestCase
+import json
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache.backends.base import BaseCache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import cache, export, health, metrics, outbox, retention
+from .models import (
+    Industry,
+    Inquiry,
+    LegalPage,
+    NavigationItem,
+    OutboundEmail,
+    ProcessStep,
+    Service,
+    SiteSettings,
+)
+
+
+class HotQueryIndexTests(TestCase):
+    """
+    The queries every page (or the inquiry admin) runs must be answered from
+    an index, not a table scan plus sort.
+    """
+
+    def _plan(self, queryset):
+        if connection.vendor == "postgresql":
+            # Tiny test tables: make the planner show the index it would use on real data
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = self._plan(queryset)
+        self.assertTrue(any(name in plan for name in index_names), msg=f"none of {index_names} used:\n{plan}")
+
+    def test_public_page_queries(self):
+        self.assertUsesIndex(
+            Service.objects.filter(is_active=True).order_by("order", "title"), "website_service_active_idx"
+        )
+        self.assertUsesIndex(
+            Industry.objects.filter(is_active=True).order_by("order", "name"), "website_industry_active_idx"
+        )
+        self.assertUsesIndex(ProcessStep.objects.all().order_by("order"), "website_step_order_idx")
+        self.assertUsesIndex(
+            NavigationItem.objects.filter(is_visible=True).order_by("order", "label"), "website_nav_visible_idx"
+        )
+
+    def test_inquiry_admin_queries(self):
+        self.assertUsesIndex(Inquiry.objects.order_by("-created_at"), "website_inquiry_created_idx")
+        # Without statistics SQLite may prefer walking created_at and filtering
+        self.assertUsesIndex(
+            Inquiry.objects.filter(is_handled=False).order_by("-created_at"),
+            "website_inquiry_handled_idx",
+            "website_inquiry_created_idx",
+        )
+
+    def test_inquiry_keyset_page(self):
+        from django.utils import timezone
+
+        from .pagination import after_cursor
+
+        cursor = f"{timezone.now().isoformat()}_100"
+        self.assertUsesIndex(
+            after_cursor(Inquiry.objects.order_by("-created_at", "-id"), cursor)[:100], "website_inquiry_created_idx"
+        )
+
+    def test_single_cta_constraint(self):
+        from django.core.exceptions import ValidationError
+        from django.db import IntegrityError, transaction
+
+        NavigationItem.objects.create(label="Book a call", kind="internal", url_name="contact", is_cta=True)
+        second = NavigationItem(label="Contact", kind="internal", url_name="contact", is_cta=True)
+        with self.assertRaises(ValidationError):
+            second.full_clean()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            second.save()
+
+
+class InquiryKeysetAdminTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        for i in range(5):
+            Inquiry.objects.create(full_name=f"A{i}", email="a@example.com", subject="S", message="0123456789")
+
+    def test_cursor_page_skips_count_and_offset(self):
+        from django.test.utils import CaptureQueriesContext
+
+        from .admin import CURSOR_VAR
+        from .pagination import encode_cursor
+
+        rows = list(Inquiry.objects.order_by("-created_at", "-id"))
+        with mock.patch("website.admin.InquiryAdmin.list_per_page", 2), CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/admin/website/inquiry/", {CURSOR_VAR: encode_cursor(rows[1])})
+        self.assertEqual(response.status_code, 200)
+        inquiry_sql = [q["sql"] for q in queries.captured_queries if "website_inquiry" in q["sql"]]
+        self.assertFalse([sql for sql in inquiry_sql if "COUNT(" in sql.upper() or "OFFSET" in sql.upper()])
+        cl = response.context["cl"]
+        self.assertEqual([obj.pk for obj in cl.result_list], [rows[2].pk, rows[3].pk])
+        self.assertEqual(cl.next_cursor, encode_cursor(rows[3]))
+
+    def test_bad_cursor(self):
+        from .admin import CURSOR_VAR
+
+        response = self.client.get("/admin/website/inquiry/", {CURSOR_VAR: "nope"})
+        # IncorrectLookupParameters: the changelist redirects with ?e=1
+        self.assertEqual(response.status_code, 302)
+
+
+class InquirySearchAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth.models import User
+
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.short = Inquiry.objects.create(
+            full_name="Jo Mueller", email="jo@example.com", subject="Parts", message="0123456789"
+        )
+        cls.company = Inquiry.objects.create(
+            full_name="Ann", email="ann@example.com", subject="Parts", message="0123456789", company_name="Mueller GmbH"
+        )
+        cls.other = Inquiry.objects.create(full_name="Bo", email="bo@example.com", subject="X", message="0123456789")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def _changelist(self, **params):
+        return self.client.get("/admin/website/inquiry/", params).context["cl"]
+
+    def test_fallback_search_matches_substrings(self):
+        # SQLite: Django's search_fields (icontains), no rank
+        cl = self._changelist(q="mueller")
+        self.assertEqual({obj.pk for obj in cl.result_list}, {self.short.pk, self.company.pk})
+        self.assertNotIn("search_rank", cl.queryset.query.annotations)
+
+    def test_rank_ordering_only_with_a_search_term(self):
+        from django.db.models.functions import Length
+
+        def ranked(queryset, term):
+            return queryset.filter(full_name__icontains="o").annotate(search_rank=Length("full_name"))
+
+        with mock.patch("website.search.enabled", return_value=True), mock.patch(
+            "website.search.search", side_effect=ranked
+        ) as search:
+            cl = self._changelist(q="o")
+            self.assertEqual([obj.pk for obj in cl.result_list], [self.short.pk, self.other.pk])
+            self.assertFalse(cl.keyset)
+
+            search.reset_mock()
+            cl = self._changelist()
+            search.assert_not_called()
+            self.assertEqual([obj.pk for obj in cl.result_list], [self.other.pk, self.company.pk, self.short.pk])
+
+
+class ProcessMemoTests(TestCase):
+    def setUp(self):
+        cache.clear_local()
+
+    def test_memo_expires_without_shared_versions(self):
+        # Another worker's save can't bump this process's generation
+        loads = []
+        with override_settings(SITE_CACHE_SHARED_VERSIONS=False, SITE_CACHE_LOCAL_TTL=5):
+            with mock.patch("website.cache.time.monotonic", return_value=100.0):
+                cache.memoize("test", lambda: loads.append(1) or len(loads))
+                self.assertEqual(cache.memoize("test", lambda: loads.append(1) or len(loads)), 1)
+            with mock.patch("website.cache.time.monotonic", return_value=106.0):
+                self.assertEqual(cache.memoize("test", lambda: loads.append(1) or len(loads)), 2)
+
+    def test_memo_kept_with_shared_versions(self):
+        with override_settings(SITE_CACHE_SHARED_VERSIONS=True):
+            with mock.patch("website.cache.time.monotonic", return_value=100.0):
+                cache.memoize("test", lambda: "old")
+            with mock.patch("website.cache.time.monotonic", return_value=10_000.0):
+                self.assertEqual(cache.memoize("test", lambda: "new"), "old")
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.enterContext(override_settings(METRICS_DIR=tmp.name))
+
+    def _write(self, pid, instance, purged):
+        state = {
+            "pid": pid,
+            "instance": instance,
+            "counters": [["tradegate_inquiries_purged_total", [], purged]],
+            "histograms": [],
+            "gauges": [["tradegate_process_resident_memory_bytes", [], 1.0]],
+        }
+        (self.dir / f"{pid}.json").write_text(json.dumps(state))
+
+    def _purged(self):
+        counters, _, gauges = metrics.collect()
+        dead = [key for key in gauges if ("pid", "999999999") in key[1]]
+        return counters.get(("tradegate_inquiries_purged_total", ()), 0), dead
+
+    def test_dead_process_folded_into_exited(self):
+        self._write(999999999, "gone", 7)
+        before, _ = self._purged()
+        self.assertFalse((self.dir / "999999999.json").exists())
+        self.assertTrue((self.dir / metrics.EXITED_FILE).exists())
+        # Folded once: a second scrape counts it exactly the same
+        after, dead = self._purged()
+        self.assertEqual(before, after)
+        self.assertEqual(dead, [])
+
+    def test_reused_pid_keeps_counters(self):
+        import os
+
+        self._write(os.getpid(), "earlier-process", 7)
+        own, _ = self._purged()
+        self.assertGreaterEqual(own, 7)
+        exited = json.loads((self.dir / metrics.EXITED_FILE).read_text())
+        self.assertIn(["tradegate_inquiries_purged_total", [], 7], exited["counters"])
+
+    @override_settings(METRICS_TOKEN="secret", METRICS_ALLOWED_IPS=["127.0.0.1"])
+    def test_proxied_requests_need_the_token(self):
+        factory = RequestFactory()
+        self.assertTrue(metrics._authorized(factory.get("/metrics")))
+        proxied = factory.get("/metrics", HTTP_X_FORWARDED_FOR="203.0.113.9")
+        self.assertFalse(metrics._authorized(proxied))
+        token = factory.get("/metrics", HTTP_X_FORWARDED_FOR="203.0.113.9", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertTrue(metrics._authorized(token))
+
+
+class ExportTests(TestCase):
+    def test_csv_defuses_formulas(self):
+        Inquiry.objects.create(
+            full_name="=HYPERLINK(\"http://evil.example\")", email="a@example.com", subject="@SUM(A1)", message="- hi"
+        )
+        lines = list(export.csv_lines(export.export_queryset(Inquiry.objects.all())))
+        self.assertIn("'=HYPERLINK", lines[1])
+        self.assertIn("'@SUM(A1)", lines[1])
+        self.assertIn("'- hi", lines[1])
+
+
+@override_settings(EMAIL_OUTBOX_BACKOFF_BASE=30, EMAIL_OUTBOX_BACKOFF_MAX=3600)
+class OutboxTests(TestCase):
+    def _queue(self, **fields):
+        return OutboundEmail.objects.create(
+            subject="New inquiry", body="Hello", from_email="site@example.com", to="team@example.com", **fields
+        )
+
+    def _failing(self):
+        connection = mock.Mock()
+        connection.send_messages.side_effect = OSError("connection refused")
+        return mock.patch("website.outbox.get_connection", return_value=connection)
+
+    def test_sent(self):
+        email = self._queue()
+        self.assertEqual(outbox.send_due(), {"sent": 1, "failed": 0, "dead": 0})
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.STATUS_SENT, 1))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failure_is_retried_later(self):
+        email = self._queue()
+        with self._failing():
+            self.assertEqual(outbox.send_due(max_attempts=3), {"sent": 0, "failed": 1, "dead": 0})
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.STATUS_PENDING, 1))
+        self.assertIn("connection refused", email.last_error)
+        delay = (email.next_attempt_at - timezone.now()).total_seconds()
+        self.assertTrue(20 < delay <= 36, delay)
+        # Not due yet: the next run leaves it alone
+        self.assertEqual(outbox.send_due(), {"sent": 0, "failed": 0, "dead": 0})
+
+    def test_dead_after_max_attempts(self):
+        email = self._queue(attempts=2)
+        with self._failing():
+            self.assertEqual(outbox.send_due(max_attempts=3), {"sent": 0, "failed": 0, "dead": 1})
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.STATUS_DEAD, 3))
+        self.assertEqual(outbox.send_due(), {"sent": 0, "failed": 0, "dead": 0})
+
+    def test_backoff_doubles_up_to_cap(self):
+        with mock.patch("website.outbox.random.uniform", return_value=1.0):
+            delays = [outbox.backoff(n).total_seconds() for n in (1, 2, 3, 20)]
+        self.assertEqual(delays, [30, 60, 120, 3600])
+
+    def test_claimed_rows_are_leased(self):
+        self._queue()
+        self.assertEqual(len(outbox.claim(10)), 1)
+        # A second worker finds nothing until the lease runs out
+        self.assertEqual(outbox.claim(10), [])
+
+
+class TimingMiddlewareTests(TestCase):
+    @override_settings(SERVER_TIMING_PUBLIC=False)
+    def test_breakdown_hidden_from_visitors(self):
+        self.assertNotIn("Server-Timing", self.client.get("/"))
+
+    @override_settings(SERVER_TIMING_PUBLIC=True)
+    def test_breakdown_when_public(self):
+        self.assertIn("total;dur=", self.client.get("/")["Server-Timing"])
+
+    def test_file_response_keeps_its_file(self):
+        import io
+
+        from django.http import FileResponse
+
+        from .middleware import TimingMiddleware
+
+        request = RequestFactory().get("/")
+        response = TimingMiddleware(lambda request: FileResponse(io.BytesIO(b"data")))(request)
+        self.assertIsNotNone(response.file_to_stream)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_timing_snapshot_view(self):
+        self.client.get("/")
+        response = self.client.get("/metrics/timing", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertIn("total", response.json()["urls"]["home"])
+        self.assertEqual(self.client.get("/metrics/timing").status_code, 404)
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.items = [
+            NavigationItem.objects.create(label=f"Item {i}", kind="internal", url_name="home") for i in range(4)
+        ]
+
+    def _request(self, view, user=None, **overrides):
+        from django.conf import settings
+
+        from .middleware import QueryBudgetMiddleware
+
+        request = RequestFactory().get("/")
+        if user is not None:
+            request.COOKIES[settings.SESSION_COOKIE_NAME] = "session"
+            request.user = user
+        with override_settings(SERVER_TIMING_PUBLIC=False, **overrides):
+            return QueryBudgetMiddleware(view)(request)
+
+    def _one_by_one(self, request):
+        from django.http import HttpResponse
+
+        for item in self.items:
+            NavigationItem.objects.get(pk=item.pk)
+        return HttpResponse("ok")
+
+    def test_repeated_query_logged_as_n_plus_one(self):
+        with self.assertLogs("website.middleware", "WARNING") as logs:
+            self._request(self._one_by_one, QUERY_BUDGET_REPEAT_THRESHOLD=4, QUERY_BUDGET_MAX_QUERIES=10)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("Possible N+1: GET / ran the same query 4 times", logs.output[0])
+
+    def test_below_repeat_threshold_is_quiet(self):
+        with self.assertNoLogs("website.middleware", "WARNING"):
+            self._request(self._one_by_one, QUERY_BUDGET_REPEAT_THRESHOLD=5, QUERY_BUDGET_MAX_QUERIES=10)
+
+    def test_over_budget_logged(self):
+        with self.assertLogs("website.middleware", "WARNING") as logs:
+            self._request(self._one_by_one, QUERY_BUDGET_REPEAT_THRESHOLD=10, QUERY_BUDGET_MAX_QUERIES=3)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("Query budget exceeded: GET / -> 200: 4 queries", logs.output[0])
+
+    def test_server_timing_for_staff_only(self):
+        from django.contrib.auth.models import AnonymousUser, User
+
+        with self.assertLogs("website.middleware", "WARNING"):
+            staff = self._request(self._one_by_one, User(username="staff", is_staff=True))
+            visitor = self._request(self._one_by_one, AnonymousUser())
+            anonymous = self._request(self._one_by_one)
+        self.assertRegex(staff["Server-Timing"], r'^db;dur=[0-9.]+;desc="4 queries"$')
+        self.assertNotIn("Server-Timing", visitor)
+        self.assertNotIn("Server-Timing", anonymous)
+
+
+class ReleaseTests(TestCase):
+    def test_release_file_written_by_the_deploy(self):
+        from . import release
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            self.assertEqual(release.release_id(root), "")
+            (root / ".git" / "refs" / "heads").mkdir(parents=True)
+            (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+            (root / ".git" / "refs" / "heads" / "main").write_text("abc123\n")
+            self.assertEqual(release.release_id(root), "abc123")
+            (root / release.RELEASE_FILE).write_text("def456\n")
+            self.assertEqual(release.release_id(root), "def456")
+
+
+class ReadinessTests(TestCase):
+    def setUp(self):
+        health._result = None
+        self.addCleanup(setattr, health, "_result", None)
+
+    def test_failure_details_stay_in_the_log(self):
+        with mock.patch("website.health.check_cache", side_effect=RuntimeError("redis://:hunter2@cache")):
+            with self.assertLogs("website.health", "WARNING"):
+                response = self.client.get("/ready/")
+        self.assertEqual(response.status_code, 503)
+        self.assertNotIn("hunter2", response.content.decode())
+        self.assertEqual(response.json()["checks"]["cache"], {"ok": False, "ms": mock.ANY})
+
+
+class RetentionTests(TestCase):
+    def _inquiry(self, days_old):
+        inquiry = Inquiry.objects.create(full_name="A", email="a@example.com", subject="S", message="0123456789")
+        Inquiry.objects.filter(pk=inquiry.pk).update(created_at=timezone.now() - timedelta(days=days_old))
+        return inquiry
+
+    def _email(self, days_old, status=OutboundEmail.STATUS_SENT):
+        email = OutboundEmail.objects.create(
+            subject="S", body="B", from_email="site@example.com", to="team@example.com", status=status
+        )
+        OutboundEmail.objects.filter(pk=email.pk).update(created_at=timezone.now() - timedelta(days=days_old))
+        return email
+
+    def test_purge_in_batches(self):
+        old = [self._inquiry(400) for _ in range(5)]
+        linked = self._email(0)
+        OutboundEmail.objects.filter(pk=linked.pk).update(inquiry=old[0])
+        fresh = self._inquiry(10)
+        orphaned = [self._email(400) for _ in range(3)]
+        pending = self._email(400, OutboundEmail.STATUS_PENDING)
+
+        counts = retention.purge(retention.cutoff(365), batch_size=2, sleep=0)
+
+        self.assertEqual(counts, {"inquiries": 5, "emails": 4, "batches": 3})
+        self.assertEqual(list(Inquiry.objects.values_list("pk", flat=True)), [fresh.pk])
+        self.assertFalse(OutboundEmail.objects.filter(pk__in=[e.pk for e in orphaned]).exists())
+        # Not delivered yet: kept
+        self.assertTrue(OutboundEmail.objects.filter(pk=pending.pk).exists())
+
+    def test_sleep_between_batches_and_time_limit(self):
+        for _ in range(3):
+            self._inquiry(400)
+        for _ in range(3):
+            self._email(400)
+
+        with mock.patch("website.retention.time.sleep") as sleep:
+            counts = retention.purge(retention.cutoff(365), batch_size=2, sleep=0.5)
+        self.assertEqual(counts["inquiries"], 3)
+        self.assertEqual(counts["emails"], 3)
+        # After every full batch: one for the inquiries, one for the emails
+        self.assertEqual(sleep.call_args_list, [mock.call(0.5), mock.call(0.5)])
+
+        for _ in range(3):
+            self._inquiry(400)
+        self._email(400)
+        # The clock runs past --max-seconds after the first batch
+        clock = iter([0.0])
+        with mock.patch("website.retention.time.monotonic", side_effect=lambda: next(clock, 100.0)):
+            counts = retention.purge(retention.cutoff(365), batch_size=2, sleep=0, max_seconds=60)
+        self.assertEqual(counts, {"inquiries": 2, "emails": 0, "batches": 1})
+        self.assertEqual(Inquiry.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    def test_archive_after_a_failed_delete(self):
+        import gzip
+
+        old = [self._inquiry(400) for _ in range(3)]
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = str(Path(tmp) / "purged.jsonl.gz")
+            # The first batch is archived, then the run dies before the delete commits
+            with mock.patch("django.db.models.query.QuerySet.delete", side_effect=RuntimeError("killed")):
+                with self.assertRaises(RuntimeError):
+                    retention.purge(retention.cutoff(365), batch_size=2, sleep=0, archive_path=archive)
+            self.assertEqual(Inquiry.objects.count(), 3)
+
+            with self.assertLogs("website.retention", "WARNING"):
+                counts = retention.purge(retention.cutoff(365), batch_size=2, sleep=0, archive_path=archive)
+            self.assertEqual(counts["inquiries"], 3)
+
+            with gzip.open(archive, "rt") as fh:
+                archived = [json.loads(line)["id"] for line in fh]
+            self.assertFalse(Path(archive + ".pending").exists())
+        self.assertEqual(sorted(archived), sorted(inquiry.pk for inquiry in old))
+
+
+class ChromeVersionTests(TestCase):
+    """
+    The cached header/footer fragments are keyed by chrome_version: an edit
+    must bump it so the next page shows the change.
+    """
+
+    def setUp(self):
+        from django.core.cache import cache as default_cache
+
+        default_cache.clear()
+        cache.clear_local()
+        self.site = SiteSettings.objects.create(site_name="Acme Trading")
+        self.item = NavigationItem.objects.create(label="Our work", kind="internal", url_name="about")
+
+    def _render(self):
+        response = self.client.get("/faq/")
+        self.assertEqual(response.status_code, 200)
+        return response.context["chrome_version"], response.content.decode()
+
+    def test_navigation_edit(self):
+        version, content = self._render()
+        self.assertIn("Our work", content)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.label = "Case studies"
+            self.item.save()
+        new_version, content = self._render()
+        self.assertNotEqual(new_version, version)
+        self.assertIn("Case studies", content)
+        self.assertNotIn("Our work", content)
+
+    def test_site_settings_edit(self):
+        version, content = self._render()
+        self.assertIn("Acme Trading", content)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.site.site_name = "Acme Sourcing"
+            self.site.save()
+        new_version, content = self._render()
+        self.assertNotEqual(new_version, version)
+        self.assertIn("Acme Sourcing", content)
+        self.assertNotIn("Acme Trading", content)
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, PAGE_CACHE_TIMEOUT=600, ALLOWED_HOSTS=["testserver", "other.example"])
+class PageCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache as default_cache
+
+        default_cache.clear()
+        cache.clear_local()
+
+    def assertPageCache(self, response, expected):
+        self.assertEqual(response.get("X-Page-Cache"), expected)
+
+    def test_second_anonymous_get_is_a_hit(self):
+        self.assertPageCache(self.client.get("/"), "miss")
+        with self.assertNumQueries(0):
+            response = self.client.get("/")
+        self.assertPageCache(response, "hit")
+        self.assertEqual(response.status_code, 200)
+
+    def test_bypassed_for_visitor_state(self):
+        from django.conf import settings
+        from django.contrib.auth import get_user_model
+
+        self.client.get("/")
+        self.client.cookies["messages"] = "pending"
+        self.assertPageCache(self.client.get("/"), None)
+        del self.client.cookies["messages"]
+
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = "abc"
+        self.assertPageCache(self.client.get("/"), None)
+        del self.client.cookies[settings.SESSION_COOKIE_NAME]
+
+        user = get_user_model().objects.create_user("staff", password="x")
+        self.client.force_login(user)
+        self.assertPageCache(self.client.get("/"), None)
+        self.client.logout()
+
+        self.assertPageCache(self.client.post("/"), None)
+
+    def test_non_200_not_cached(self):
+        self.assertEqual(self.client.get("/legal/impressum/").status_code, 404)
+        response = self.client.get("/legal/impressum/")
+        self.assertEqual(response.status_code, 404)
+        self.assertPageCache(response, None)
+
+    def test_keyed_by_host_and_scheme(self):
+        self.assertPageCache(self.client.get("/"), "miss")
+        self.assertPageCache(self.client.get("/", HTTP_HOST="other.example"), "miss")
+        self.assertPageCache(self.client.get("/", secure=True), "miss")
+        self.assertPageCache(self.client.get("/", HTTP_HOST="other.example"), "hit")
+
+    def test_purged_when_content_changes(self):
+        rows = [
+            SiteSettings.objects.create(site_name="TradeGate"),
+            NavigationItem.objects.create(label="About", kind="internal", url_name="about"),
+            Service.objects.create(title="Representation", short_description="d"),
+            Industry.objects.create(name="Food"),
+            ProcessStep.objects.create(title="Call", description="d"),
+            LegalPage.objects.create(key="impressum", title="Impressum", content="x" * 30),
+        ]
+        for row in rows:
+            for change in (row.save, row.delete):
+                with self.subTest(model=type(row).__name__, change=change.__name__):
+                    self.client.get("/")
+                    self.assertPageCache(self.client.get("/"), "hit")
+                    with self.captureOnCommitCallbacks(execute=True):
+                        change()
+                    self.assertPageCache(self.client.get("/"), "miss")
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear_local()
+        self.older = Service.objects.create(title="Representation", short_description="d")
+        self.newer = Service.objects.create(title="Trade fairs", short_description="d")
+
+    def _etag(self):
+        return self.client.get("/")["ETag"]
+
+    def test_validators_and_304(self):
+        response = self.client.get("/")
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_etag_changes_on_edit(self):
+        before = self._etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.older.title = "EU representation"
+            self.older.save()
+        self.assertNotEqual(self._etag(), before)
+
+    def test_etag_changes_on_delete(self):
+        # Deleting the older row leaves max(updated_at) where it was: only the count moves
+        before = self._etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.older.delete()
+        after = self.client.get("/", HTTP_IF_NONE_MATCH=before)
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after["ETag"], before)
+
+
+class UnreachableCache(BaseCache):
+    """
+    L2 stand-in for a Redis server that is down.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+
+    def _down(self, *args, **kwargs):
+        raise ConnectionRefusedError("L2 is down")
+
+    get = set = add = get_many = set_many = has_key = touch = incr = decr = delete = delete_many = clear = _down
+
+
+def tiered_caches(l2_backend="django.core.cache.backends.locmem.LocMemCache"):
+    return {
+        "local": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test-l1"},
+        "shared": {"BACKEND": l2_backend, "LOCATION": "test-l2"},
+        "default": {
+            "BACKEND": "website.cache_backends.TieredCache",
+            "OPTIONS": {"L1": "local", "L2": "shared", "L1_TIMEOUT": 30, "L1_KEY_TIMEOUTS": {"website:version:": 2}},
+        },
+    }
+
+
+class TieredCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import caches
+
+        self.enterContext(override_settings(CACHES=tiered_caches()))
+        self.tiered, self.l1, self.l2 = caches["default"], caches["local"], caches["shared"]
+        self.l1.clear()
+        self.l2.clear()
+
+    def _l1_ttl(self, key):
+        return self.l1._expire_info[self.l1.make_and_validate_key(key)] - time.time()
+
+    def test_l1_hit(self):
+        self.tiered.set("k", "v")
+        self.l2.delete("k")
+        self.assertEqual(self.tiered.get("k"), "v")
+
+    def test_l2_hit_is_promoted_with_key_ttl(self):
+        self.l2.set("website:version:pages", 7, 600)
+        self.l2.set("other", "v", 600)
+        found = self.tiered.get_many(["website:version:pages", "other"])
+        self.assertEqual(found, {"website:version:pages": 7, "other": "v"})
+        self.assertAlmostEqual(self._l1_ttl("website:version:pages"), 2, delta=0.5)
+        self.assertAlmostEqual(self._l1_ttl("other"), 30, delta=0.5)
+        # Never longer than the entry's own timeout
+        self.tiered.set("short", "v", 5)
+        self.assertAlmostEqual(self._l1_ttl("short"), 5, delta=0.5)
+
+    def test_delete_clears_both_tiers(self):
+        self.tiered.set("k", "v")
+        self.tiered.delete("k")
+        self.assertIsNone(self.l1.get("k"))
+        self.assertIsNone(self.l2.get("k"))
+        self.assertIsNone(self.tiered.get("k"))
+
+
+class UnreachableL2Tests(TestCase):
+    def setUp(self):
+        self.enterContext(override_settings(CACHES=tiered_caches("website.tests.UnreachableCache")))
+        cache.clear_local()
+
+    def test_cache_keeps_working_from_l1(self):
+        from django.core.cache import caches
+
+        tiered = caches["default"]
+        with self.assertLogs("website.cache_backends", "WARNING"):
+            tiered.set("k", "v")
+        self.assertEqual(tiered.get("k"), "v")
+        self.assertTrue(tiered.add("new", 1))
+        self.assertEqual(tiered.incr("new"), 2)
+        tiered.delete("k")
+        self.assertIsNone(tiered.get("k"))
+
+    def test_pages_render(self):
+        SiteSettings.objects.create(site_name="TradeGate")
+        with self.assertLogs("website.cache_backends", "WARNING"):
+            self.assertEqual(self.client.get("/").status_code, 200)
+        self.assertEqual(self.client.get("/about/").status_code, 200)
+
+
+def reload_urlconf():
+    """
+    Re-import the URLconfs, e.g. after changing ASYNC_VIEWS.
+    """
+    import importlib
+
+    from django.urls import clear_url_caches
+
+    import tradegate.urls
+    import website.urls
+
+    importlib.reload(website.urls)
+    importlib.reload(tradegate.urls)
+    clear_url_caches()
+
+
+INQUIRY_POST = {
+    "full_name": "Ada Lovelace",
+    "email": "ada@example.com",
+    "service_interest": "scouting",
+    "subject": "Sourcing",
+    "message": "We are looking for a supplier.",
+    "consent": "on",
+    "contact_method": "email",
+}
+
+
+class ContactViewMixin:
+    def assertInquiryReceived(self, response):
+        # After follow=True: redirected back to the form with a success message
+        self.assertEqual(response.redirect_chain, [(reverse("contact") + "#contact-form", 302)])
+        self.assertEqual(
+            [(m.level_tag, str(m)) for m in response.context["messages"]],
+            [("success", "Thanks — your message has been sent successfully. We’ll respond within 24–48 hours.")],
+        )
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class ContactViewTests(ContactViewMixin, TestCase):
+    def test_post(self):
+        SiteSettings.objects.create(site_name="TradeGate")
+        self.assertInquiryReceived(self.client.post("/contact/", INQUIRY_POST, follow=True))
+        self.assertEqual(Inquiry.objects.count(), 1)
+
+
+class AsyncViewTests(ContactViewMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Cleanups run last-in first-out: settings are restored, then the URLconf
+        cls.addClassCleanup(reload_urlconf)
+        cls.enterClassContext(override_settings(ASYNC_VIEWS=True))
+        reload_urlconf()
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        SiteSettings.objects.create(site_name="Acme Trading")
+        LegalPage.objects.create(key="impressum", title="Impressum", content="Company details " * 3)
+
+    def setUp(self):
+        cache.clear_local()
+
+    def test_urls_switch_to_async_views(self):
+        from django.urls import resolve
+
+        from . import async_views, views
+
+        self.assertIs(resolve("/").func, async_views.home)
+        self.assertIs(resolve("/contact/").func, async_views.contact)
+        with override_settings(ASYNC_VIEWS=False):
+            reload_urlconf()
+            try:
+                self.assertIs(resolve("/").func, views.home)
+            finally:
+                reload_urlconf()
+
+    async def test_pages(self):
+        response = await self.async_client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Acme Trading")
+        response = await self.async_client.get("/legal/impressum/")
+        self.assertContains(response, "Company details")
+        response = await self.async_client.get("/legal/nope/")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_contact_post(self):
+        from asgiref.sync import sync_to_async
+
+        from . import views
+
+        with mock.patch("website.async_views.sync_to_async", wraps=sync_to_async) as to_thread:
+            response = await self.async_client.post("/contact/", INQUIRY_POST, follow=True)
+        # The SMTP send runs in a thread, off the event loop
+        to_thread.assert_any_call(views._notify_inquiry, thread_sensitive=False)
+        self.assertInquiryReceived(response)
+        self.assertEqual(await Inquiry.objects.acount(), 1)
@@ -0,0 +1,214 @@
+"""
+Per-phase request timing.
+
+Phases (milliseconds, exclusive of each other):
+- middleware: everything outside the view (the whole middleware chain)
+- view:       the view body itself, minus template rendering
+- cp.<name>:  each template context processor
+- render:     template rendering, minus the context processors
+- db:         time in SQL (from QueryBudgetMiddleware; overlaps the others)
+- stream:     iterating a StreamingHttpResponse (after the headers are sent,
+              so it is only in the log line and the histograms)
+
+The breakdown goes into the Server-Timing header and, with
+REQUEST_TIMING_LOG, into one `key=value` log line per request. Every request
+also feeds in-memory samples per URL name, summarised by snapshot() as
+p50/p95/p99.
+
+Wiring (settings): TimingMiddleware first and ViewTimingMiddleware last in
+MIDDLEWARE, and TimedDjangoTemplates as the template BACKEND.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from functools import wraps
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+TOTAL = "total"
+
+_lock = threading.Lock()
+
+# url name -> phase -> recent samples (ms)
+_samples: dict[str, dict[str, deque]] = defaultdict(dict)
+
+
+class RequestTiming:
+    """
+    Phase durations for one request, stored as request.timing.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.render_depth = 0
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds * 1000
+
+    def get(self, phase: str) -> float:
+        return self.phases.get(phase, 0.0)
+
+    def context_processors_ms(self) -> float:
+        return sum(ms for phase, ms in self.phases.items() if phase.startswith("cp."))
+
+
+def url_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name
+
+
+# =========================
+# Histograms
+# =========================
+def _max_samples() -> int:
+    return getattr(settings, "REQUEST_TIMING_SAMPLES", 1024)
+
+
+def record(name: str, phases: dict[str, float]) -> None:
+    """
+    Add one request's phase durations to the samples for URL `name`.
+    """
+    with _lock:
+        per_phase = _samples[name]
+        for phase, ms in phases.items():
+            bucket = per_phase.get(phase)
+            if bucket is None:
+                bucket = per_phase[phase] = deque(maxlen=_max_samples())
+            bucket.append(ms)
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile (q in 0..1) of samples sorted ascending.
+    """
+    index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def snapshot() -> dict[str, dict[str, dict[str, float]]]:
+    """
+    {url name: {phase: {"count", "p50", "p95", "p99"}}} over the recent samples.
+    """
+    with _lock:
+        copied = {name: {phase: list(bucket) for phase, bucket in phases.items()} for name, phases in _samples.items()}
+
+    result = {}
+    for name, phases in copied.items():
+        result[name] = {}
+        for phase, values in phases.items():
+            if not values:
+                continue
+            values.sort()
+            result[name][phase] = {
+                "count": len(values),
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99),
+            }
+    return result
+
+
+def reset() -> None:
+    with _lock:
+        _samples.clear()
+
+
+# =========================
+# Templates
+# =========================
+def _timed_processor(processor):
+    name = "cp." + getattr(processor, "__name__", type(processor).__name__)
+
+    @wraps(processor)
+    def _wrapped(request):
+        timing = getattr(request, "timing", None)
+        if timing is None:
+            return processor(request)
+        start = time.perf_counter()
+        try:
+            return processor(request)
+        finally:
+            timing.add(name, time.perf_counter() - start)
+
+    return _wrapped
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timing = getattr(request, "timing", None)
+        if timing is None or timing.render_depth:
+            # Nested renders are already inside the outer measurement
+            return super().render(context, request)
+
+        timing.render_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timing.render_depth -= 1
+            timing.add("render.total", time.perf_counter() - start)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    DjangoTemplates that reports render and context processor time to request.timing.
+    """
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.engine.template_context_processors = tuple(
+            _timed_processor(processor) for processor in self.engine.template_context_processors
+        )
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+# =========================
+# Reporting
+# =========================
+def breakdown(timing: RequestTiming, total_ms: float, db_ms: float | None = None) -> dict[str, float]:
+    """
+    Exclusive phase durations (ms) of a finished request.
+    """
+    cp_ms = timing.context_processors_ms()
+    render_ms = max(timing.get("render.total") - cp_ms, 0.0)
+    view_ms = timing.get("view.total")
+
+    phases = {
+        TOTAL: total_ms,
+        "middleware": max(total_ms - view_ms, 0.0),
+        "view": max(view_ms - render_ms - cp_ms, 0.0),
+        "render": render_ms,
+    }
+    phases.update((phase, ms) for phase, ms in timing.phases.items() if phase.startswith("cp."))
+    if db_ms is not None:
+        phases["db"] = db_ms
+    return phases
+
+
+def log_line(request, status: int, phases: dict[str, float]) -> None:
+    if not getattr(settings, "REQUEST_TIMING_LOG", False):
+        return
+    logger.info(
+        "timing method=%s path=%s url=%s status=%s %s",
+        request.method,
+        request.path,
+        url_name(request),
+        status,
+        " ".join(f"{phase}={ms:.1f}" for phase, ms in phases.items()),
+    )
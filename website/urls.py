@@ -1,6 +1,11 @@
+from django.conf import settings
 from django.urls import path
+
 from . import views
 
+if settings.ASYNC_VIEWS:
+    from . import async_views as views  # noqa: F811
+
 urlpatterns = [
     # Homepage (root, canonical)
     path("", views.home, name="home"),
@@ -14,5 +19,3 @@ urlpatterns = [
     # Kept exactly as legal_page.html expects
     path("legal/<slug:key>/", views.legal_page, name="legal_page"),
 ]
-
-
@@ -1,34 +1,34 @@
 import logging
+import time
 
 from django.conf import settings
 from django.contrib import messages
 from django.core.mail import EmailMessage
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
+from . import metrics, outbox
+from .cache import get_site_settings
+from .conditional import conditional_page, home_stamp, legal_page_stamp, site_page_stamp
 from .forms import InquiryForm
-from .models import SiteSettings, Service, Industry, ProcessStep, LegalPage, Inquiry
+from .models import Service, Industry, ProcessStep, LegalPage, Inquiry
+from .page_cache import cache_public_page
 
 logger = logging.getLogger(__name__)
 
 
-def _get_settings():
-    return SiteSettings.objects.first()
-
-
 def _site_name(site):
     return site.site_name if site and site.site_name else "TradeGate"
 
 
-def home(request):
-    site = _get_settings()
-
-    services = Service.objects.filter(is_active=True).order_by("order", "title")
-    industries = Industry.objects.filter(is_active=True).order_by("order", "name")
-    steps = ProcessStep.objects.all().order_by("order")
-
-    context = {
+# =========================
+# Page contexts (shared with website.async_views, which only differs in how
+# the data is loaded)
+# =========================
+def _home_context(request, site, services, industries, steps):
+    return {
         "services": services,
         "industries": industries,
         "steps": steps,
@@ -39,14 +39,10 @@ def home(request):
             "canonical": request.build_absolute_uri("/"),
         },
     }
-    return render(request, "website/home.html", context)
 
 
-def legal_page(request, key):
-    page = get_object_or_404(LegalPage, key=key)
-    site = _get_settings()
-
-    context = {
+def _legal_page_context(request, site, page):
+    return {
         "page": page,
         "page_meta": {
             "title": page.meta_title or page.title,
@@ -55,100 +51,10 @@ def legal_page(request, key):
             "canonical": request.build_absolute_uri(page.get_absolute_url()),
         },
     }
-    return render(request, "website/legal_page.html", context)
-
-
-@require_http_methods(["GET", "POST"])
-def contact(request):
-    site = _get_settings()
-
-    if request.method == "POST":
-        form = InquiryForm(request.POST)
-
-        if form.is_valid():
-            cd = form.cleaned_data
-
-            inquiry = Inquiry.objects.create(
-                full_name=cd["full_name"],
-                email=cd["email"],
-                subject=cd["subject"],
-                message=cd["message"],
-                company_name=cd.get("company_name", "") or "",
-                website=cd.get("website", "") or "",
-                country=cd.get("country", "") or "",
-                service_interest=cd.get("service_interest", "") or "",
-                timeline=cd.get("timeline", "") or "",
-                budget_range=cd.get("budget_range", "") or "",
-                contact_method=cd.get("contact_method", "") or "",
-                phone=cd.get("phone", "") or "",
-                consent=cd.get("consent", False),
-                ip_address=request.META.get("REMOTE_ADDR"),
-                user_agent=(request.META.get("HTTP_USER_AGENT") or "")[:255],
-            )
-
-            receiver = getattr(settings, "CONTACT_RECIPIENT_EMAIL", "") or "contact@tradegateconsultants.com"
-            from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "") or "no-reply@tradegateconsultants.com"
-
-            email_subject = f"[{_site_name(site)}] New inquiry: {inquiry.subject}"
-            email_body = (
-                "New inquiry received\n\n"
-                f"Name: {inquiry.full_name}\n"
-                f"Email: {inquiry.email}\n"
-                f"Company: {inquiry.company_name}\n"
-                f"Website: {inquiry.website}\n"
-                f"Country/Region: {inquiry.country}\n\n"
-                f"Service interest: {inquiry.service_interest}\n"
-                f"Timeline: {inquiry.timeline}\n"
-                f"Budget range: {inquiry.budget_range}\n"
-                f"Preferred contact method: {inquiry.contact_method}\n"
-                f"Phone/WhatsApp: {inquiry.phone}\n\n"
-                f"Subject: {inquiry.subject}\n\n"
-                "Message:\n"
-                f"{inquiry.message}\n\n"
-                f"IP: {inquiry.ip_address}\n"
-                f"User-Agent: {inquiry.user_agent}\n"
-            )
-
-            email_sent = False
-
-            try:
-                msg = EmailMessage(
-                    subject=email_subject,
-                    body=email_body,
-                    from_email=from_email,
-                    to=[receiver],
-                    reply_to=[inquiry.email],
-                )
-                msg.send(fail_silently=False)
-                email_sent = True
-                logger.info(
-                    "Contact email sent successfully for inquiry_id=%s to=%s",
-                    inquiry.id,
-                    receiver,
-                )
-            except Exception:
-                logger.exception("Contact email failed for inquiry_id=%s", inquiry.id)
-
-            if email_sent:
-                messages.success(
-                    request,
-                    "Thanks — your message has been sent successfully. We’ll respond within 24–48 hours.",
-                )
-            else:
-                messages.warning(
-                    request,
-                    "Your message was received successfully, but our email notification had a temporary issue. We will still respond within 24–48 hours.",
-                )
-
-            return redirect(reverse("contact") + "#contact-form")
-
-        logger.warning("Contact form invalid: %s", form.errors.as_json())
-        messages.error(request, "Please correct the highlighted fields and try again.")
 
-    else:
-        form = InquiryForm()
 
-    context = {
+def _contact_context(request, form):
+    return {
         "form": form,
         "page_meta": {
             "title": "Contact",
@@ -156,27 +62,193 @@ def contact(request):
             "canonical": request.build_absolute_uri("/contact/"),
         },
     }
-    return render(request, "website/contact.html", context)
 
 
-def about(request):
-    context = {
+def _about_context(request):
+    return {
         "page_meta": {
             "title": "About",
             "description": "Learn about TradeGate and our EU business representation services.",
             "canonical": request.build_absolute_uri("/about/"),
         }
     }
-    return render(request, "website/about.html", context)
 
 
-def faq(request):
-    page_meta = {
-        "title": "FAQs",
-        "description": "Frequently asked questions about TradeGate Consultants: EU representation, trade fairs, market entry, and deliverables.",
-        "canonical": request.build_absolute_uri(),
+def _faq_context(request):
+    return {
+        "page_meta": {
+            "title": "FAQs",
+            "description": "Frequently asked questions about TradeGate Consultants: EU representation, trade fairs, market entry, and deliverables.",
+            "canonical": request.build_absolute_uri(),
+        }
     }
-    return render(request, "website/faq.html", {"page_meta": page_meta})
+
+
+@conditional_page(home_stamp)
+@cache_public_page
+def home(request):
+    site = get_site_settings(request)
+
+    services = Service.objects.filter(is_active=True).order_by("order", "title")
+    industries = Industry.objects.filter(is_active=True).order_by("order", "name")
+    steps = ProcessStep.objects.all().order_by("order")
+
+    return render(request, "website/home.html", _home_context(request, site, services, industries, steps))
+
+
+@conditional_page(legal_page_stamp)
+@cache_public_page
+def legal_page(request, key):
+    page = get_object_or_404(LegalPage, key=key)
+    site = get_site_settings(request)
+
+    return render(request, "website/legal_page.html", _legal_page_context(request, site, page))
+
+
+def _inquiry_email(site, inquiry):
+    receiver = getattr(settings, "CONTACT_RECIPIENT_EMAIL", "") or "contact@tradegateconsultants.com"
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "") or "no-reply@tradegateconsultants.com"
+
+    email_subject = f"[{_site_name(site)}] New inquiry: {inquiry.subject}"
+    email_body = (
+        "New inquiry received\n\n"
+        f"Name: {inquiry.full_name}\n"
+        f"Email: {inquiry.email}\n"
+        f"Company: {inquiry.company_name}\n"
+        f"Website: {inquiry.website}\n"
+        f"Country/Region: {inquiry.country}\n\n"
+        f"Service interest: {inquiry.service_interest}\n"
+        f"Timeline: {inquiry.timeline}\n"
+        f"Budget range: {inquiry.budget_range}\n"
+        f"Preferred contact method: {inquiry.contact_method}\n"
+        f"Phone/WhatsApp: {inquiry.phone}\n\n"
+        f"Subject: {inquiry.subject}\n\n"
+        "Message:\n"
+        f"{inquiry.message}\n\n"
+        f"IP: {inquiry.ip_address}\n"
+        f"User-Agent: {inquiry.user_agent}\n"
+    )
+
+    return EmailMessage(
+        subject=email_subject,
+        body=email_body,
+        from_email=from_email,
+        to=[receiver],
+        reply_to=[inquiry.email],
+    )
+
+
+def _save_inquiry(request, form, site, use_outbox):
+    """
+    Store the inquiry and, with the outbox, queue its notification in the same transaction.
+    """
+    cd = form.cleaned_data
+    with transaction.atomic():
+        inquiry = Inquiry.objects.create(
+            full_name=cd["full_name"],
+            email=cd["email"],
+            subject=cd["subject"],
+            message=cd["message"],
+            company_name=cd.get("company_name", "") or "",
+            website=cd.get("website", "") or "",
+            country=cd.get("country", "") or "",
+            service_interest=cd.get("service_interest", "") or "",
+            timeline=cd.get("timeline", "") or "",
+            budget_range=cd.get("budget_range", "") or "",
+            contact_method=cd.get("contact_method", "") or "",
+            phone=cd.get("phone", "") or "",
+            consent=cd.get("consent", False),
+            ip_address=request.META.get("REMOTE_ADDR"),
+            user_agent=(request.META.get("HTTP_USER_AGENT") or "")[:255],
+        )
+        metrics.inc("tradegate_inquiries_total")
+
+        msg = _inquiry_email(site, inquiry)
+        if use_outbox:
+            outbox.enqueue(msg, inquiry=inquiry)
+    return inquiry, msg
+
+
+def _notify_inquiry(inquiry, msg, use_outbox) -> bool:
+    """
+    Send the notification (unless it was queued); True when it went out or is queued.
+    """
+    if use_outbox:
+        logger.info("Contact email queued for inquiry_id=%s", inquiry.id)
+        return True
+
+    start = time.perf_counter()
+    try:
+        msg.send(fail_silently=False)
+    except Exception:
+        metrics.inc("tradegate_emails_total", result="failed")
+        logger.exception("Contact email failed for inquiry_id=%s", inquiry.id)
+        return False
+
+    metrics.observe("tradegate_email_send_duration_seconds", time.perf_counter() - start)
+    metrics.inc("tradegate_emails_total", result="sent")
+    logger.info(
+        "Contact email sent successfully for inquiry_id=%s to=%s",
+        inquiry.id,
+        ", ".join(msg.to),
+    )
+    return True
+
+
+def _inquiry_received(request, email_sent):
+    if email_sent:
+        messages.success(
+            request,
+            "Thanks — your message has been sent successfully. We’ll respond within 24–48 hours.",
+        )
+    else:
+        messages.warning(
+            request,
+            "Your message was received successfully, but our email notification had a temporary issue. We will still respond within 24–48 hours.",
+        )
+
+    return redirect(reverse("contact") + "#contact-form")
+
+
+def _inquiry_invalid(request, form):
+    logger.warning("Contact form invalid: %s", form.errors.as_json())
+    messages.error(request, "Please correct the highlighted fields and try again.")
+
+
+@require_http_methods(["GET", "POST"])
+def contact(request):
+    site = get_site_settings(request)
+
+    if request.method == "POST":
+        form = InquiryForm(request.POST)
+
+        if form.is_valid():
+            # The notification is queued in the same transaction as the
+            # inquiry; `manage.py send_outbox` delivers it outside the request.
+            use_outbox = getattr(settings, "EMAIL_OUTBOX_ENABLED", False)
+
+            inquiry, msg = _save_inquiry(request, form, site, use_outbox)
+            email_sent = _notify_inquiry(inquiry, msg, use_outbox)
+            return _inquiry_received(request, email_sent)
+
+        _inquiry_invalid(request, form)
+
+    else:
+        form = InquiryForm()
+
+    return render(request, "website/contact.html", _contact_context(request, form))
+
+
+@conditional_page(site_page_stamp)
+@cache_public_page
+def about(request):
+    return render(request, "website/about.html", _about_context(request))
+
+
+@conditional_page(site_page_stamp)
+@cache_public_page
+def faq(request):
+    return render(request, "website/faq.html", _faq_context(request))
 
 
 
@@ -0,0 +1,105 @@
+"""
+Warm a freshly started worker so its first request is not the slow one.
+
+Code (no database, safe before gunicorn forks):
+- the URL resolver, reverse() for every named route, and with it the
+  lazily imported view modules and admin URLs
+- every template under website/templates/website/, compiled into the cached
+  loader (production)
+
+Data (needs a database connection, so only after fork):
+- SiteSettings, navigation and the conditional GET stamps (website.cache)
+
+Entry points:
+- tradegate/wsgi.py and asgi.py call warm_on_startup() at import, which
+  warms per DJANGO_WARMUP: "code" (default), "full" or "off". Under
+  gunicorn --preload that runs once in the master and workers inherit it.
+- gunicorn.conf.py post_worker_init runs warm() in every new worker.
+- `manage.py warmup` runs it and prints how long each step took.
+
+Every step is best-effort: a failure is logged and the worker starts anyway.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+
+from django.db import close_old_connections
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+
+def warm_urls() -> None:
+    resolver = get_resolver()
+    # Builds the reverse dict for the whole tree (lazy otherwise)
+    for name in [key for key in resolver.reverse_dict if isinstance(key, str)]:
+        try:
+            reverse(name)
+        except Exception:
+            # Routes with arguments (legal_page) need kwargs; the dict is built anyway
+            pass
+
+
+def template_names() -> list[str]:
+    return sorted(
+        path.relative_to(TEMPLATE_DIR).as_posix() for path in (TEMPLATE_DIR / "website").rglob("*.html")
+    )
+
+
+def warm_templates() -> None:
+    for name in template_names():
+        get_template(name)
+
+
+def warm_site_data() -> None:
+    from . import cache
+    from .conditional import content_stamps
+
+    cache.get_site_settings()
+    cache.get_navigation()
+    content_stamps()
+
+
+CODE_STEPS = (
+    ("urls", warm_urls),
+    ("templates", warm_templates),
+)
+
+DATA_STEPS = (("site_data", warm_site_data),)
+
+
+def warm(data: bool = True) -> dict[str, float]:
+    """
+    Run the warm-up steps (code only with data=False); returns {step: milliseconds}.
+    """
+    timings = {}
+    for name, step in CODE_STEPS + (DATA_STEPS if data else ()):
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warm-up step %s failed", name)
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    if data:
+        # Keep the connection only if CONN_MAX_AGE allows, as after a request
+        close_old_connections()
+    logger.info("Warmed pid=%s: %s", os.getpid(), ", ".join(f"{n}={ms}ms" for n, ms in timings.items()))
+    return timings
+
+
+def warm_on_startup() -> None:
+    """
+    Warm at WSGI/ASGI import time according to DJANGO_WARMUP.
+    """
+    mode = os.getenv("DJANGO_WARMUP", "code").strip().lower()
+    if mode in ("", "0", "off", "false", "no"):
+        return
+    warm(data=mode == "full")